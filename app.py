@@ -1,399 +1,226 @@
 import streamlit as st
 import pandas as pd
-import gspread
-from google.oauth2.service_account import Credentials
 from datetime import datetime # <-- 이 부분이 추가되었습니다.
-from pathlib import Path
-SA_PATH = Path(__file__).parent / ".streamlit" / "clever-circlet-237312-ba0859893ad2.json"
+from functools import partial
+import html
+
+import metrics
+from course_static import grading_table_html
+from courses import course_errors, select_course
+from grading import get_grade_engine
+from materials import INLINE_DOWNLOAD_MAX_BYTES, format_size, get_material_index
+from qna_queue import get_write_queue
+from qna_sync import filter_qna, get_qna_sync, qna_cache_key, qna_version
+from resilience import SheetReadError, get_circuit_breaker, guarded, with_backoff
+from settings import get_setting
+from sheet_cache import get_sheet_cache
+from storage import get_storage_backend, get_storage_breakers, storage_backend_name
+from tables import generate_styled_html_table, weekly_plan_html
 
 
-# === 추가: GSheetsConnection 사용 가능하면 먼저 시도 ===
-try:
-    from streamlit_gsheets import GSheetsConnection
-    HAS_GSHEETS_CONN = True
-except Exception:
-    HAS_GSHEETS_CONN = False
-
+# --------------------
+# 강의 선택: ?course=<ID> (courses/<ID>.toml). 모든 강의가 한 프로세스에서 클라이언트 풀/시트 캐시를 공유
+# --------------------
+COURSE, COURSE_FOUND = select_course(st.query_params.get("course"))
 
 # --------------------
 # 페이지 기본 설정
 # --------------------
 st.set_page_config(
-    page_title="[과목명] 강의 웹페이지",
+    page_title=f"{COURSE.title} 강의 웹페이지",
     page_icon="🎓",
     layout="wide",
 )
 
-# --------------------
-# 강의 정보 (사용자님 내용 그대로 유지)
-# --------------------
-COURSE_TITLE = "역사학 논문쓰기 1(25-2)"
-COURSE_CODE = "M3533.001500. 강좌001"
-PROFESSOR_NAME = "허 수 교수"
-PROFESSOR_EMAIL = "crctaper@snu.ac.kr"
-DAY_TIME = "화, 10:00~12:50"
-CLASSROOM = "14-203"
+# Q&A 목록 한 번에 렌더링할 질문 수 (더 보기로 늘어남)
+QNA_PAGE_SIZES = [10, 20, 50]
+# Q&A 화면을 열어 둔 동안 새 질문/답변을 확인하는 간격 (초)
+QNA_POLL_INTERVAL_S = float(get_setting("qna_poll_interval_s", 15))
 
 
-# --------------------
-# 주차별 강의 계획 데이터 (사용자님 내용 그대로 유지)
-# --------------------
-schedule_data = {
-    '단계': [
-        '[1부]<br>연구계획서 작성', '', '',
-        '[2부]<br>연구사 정리', '', '',
-        '[3부]<br>사료 읽기', '', '',
-        '[4부]<br>초고 쓰기', '', '',
-        '[5부]<br>논문 완성', '', ''
-    ],
-    '주차': [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15],
-    '내용': ['강의 소개', '역사논문 작성법', '연구계획서 발표', '학술논문 2편 요약', '연구사 노트', '연구사 노트', '1차 사료 소개', '사료 노트', '사료 노트', '초고 작성 개요', '초고 작성', '초고 작성', '완고 발표', '완고 발표', '완고 발표'],
-    '일자': [
-        '09.02', '09.09', '09.16', '09.23', '09.30', '10.07', '10.14',
-        '10.21', '10.28', '11.04', '11.11', '11.18', '11.25', '12.02', '12.09'
-    ],
-    '목표': [
-        '강의의 목표, 과정, 참여 방법', '역사논문 작성법 발제<br>작성법에 관한 의견 교환', '졸업논문의 설계도 작성 (개인별)<br>교수자 및 수강자 동료의 피드백', '효과적인 연구사 노트 방법',
-        '주제와 밀접한 연구사 정리 (1/2)', '주제와 밀접한 연구사 정리 (2/2)', '효과적인 사료 노트 방법', '주제와 밀접한 1차 사료 (1/2)', '주제와 밀접한 1차 사료 (2/2)',
-        '논문 초고의 개요 작성', '논문 초고 작성 (1/2)', '논문 초고 작성 (2/2)', '완고 발표 & 피드백 (1/3)', '완고 발표 & 피드백 (2/3)', '완고 발표 & 피드백 (3/3)'
-    ],
-    '과제 제출<br>(일자정, etc)': ['-', '제출(일부)', '<font color="blue">제출(전원)</font>', '<font color="blue">제출(전원)</font>', '제출(1/2)', '제출(2/2)', '<font color="blue">제출(전원)</font>', '제출(1/2)', '제출(2/2)', '<font color="blue">제출(전원)</font>', '제출(1/2)', '제출(2/2)', '제출(1/3)', '제출(2/3)', '제출(3/3)'],
-    '수업 발표': ['강의', '발표(일부)', '<font color="blue">발표(전원)</font>', '<font color="blue">발표(전원)</font>', '발표(일부)', '발표(일부)', '<font color="blue">발표(전원)</font>', '발표(일부)', '발표(일부)', '<font color="blue">발표(전원)</font>', '발표(일부)', '발표(일부)', '발표(일부)', '발표(일부)', '발표(일부)'],
-    '기타 과제<br>(확인서, etc)': ['-', '-', '-', '-', '-', '-', '<font color="blue">교수 면담(1)</font>', '-', '<font color="blue">글쓰기 지도(1)</font>', '-', '<font color="blue">교수 면담(2)</font>', '-', '<font color="blue">글쓰기 지도(2)</font>', '-', '-']
-}
-df_schedule = pd.DataFrame(schedule_data)
-row_spans = df_schedule['단계'].ne('').cumsum()
-df_schedule['rowspan'] = row_spans.map(row_spans.value_counts())
+# --- 공용: 시트 읽기 캐시 ---
+# 시트 I/O는 storage.get_storage_backend()가 고른 백엔드(구글 시트 / 로컬)로 간다.
+# 모든 시트 읽기는 공용 SheetCache를 거친다 (세션 간 공유, 만료 시 이전 값 제공 + 백그라운드 갱신,
+# Drive modifiedTime이 그대로면 값을 다시 받지 않음, 시트당 동시 fetch 1회).
+# fetch/signal은 백그라운드 갱신 스레드에서도 불리므로, cache_resource 객체(백엔드/캐시/회로 차단기)는
+# 스크립트 스레드에서 미리 받아 클로저로 넘긴다 (스레드에서 부르면 "missing ScriptRunContext" 경고).
+def cached_sheet_read(key, fetch, sheet_url, pool_source="file"):
+    backend = get_storage_backend(pool_source)
+    return get_sheet_cache().get(key, fetch, signal=lambda: backend.last_update_time(sheet_url))
 
 
 # --- 공용: 시트 읽기 (GSheetsConnection 우선, 실패 시 gspread로 폴백) ---
-@st.cache_data(ttl=15)
-def read_sheet_df(sheet_url: str, worksheet: str):
-    errors = []
+# 경로마다 회로 차단기: 연속 실패한 경로는 잠시 건너뛰고(타임아웃을 매번 기다리지 않음), 일정 시간 후 한 번 시험.
+# 429는 지수 백오프 + jitter로 재시도. 모두 실패하면 SheetReadError를 올려 보내 캐시에 남지 않게 한다.
+def _gsheets_connection_type():
+    """streamlit_gsheets가 설치돼 있으면 GSheetsConnection, 아니면 None. 시트가 실제로 필요할 때만 import."""
+    try:
+        from streamlit_gsheets import GSheetsConnection
+        return GSheetsConnection
+    except Exception:
+        return None
 
+
+def _read_via_gsheets_connection(conn, sheet_url: str, worksheet: str):
+    # 캐시는 SheetCache가 담당하므로 커넥션 자체 캐시는 끔
+    df = conn.read(spreadsheet=sheet_url, worksheet=worksheet, ttl=0)
+    if not isinstance(df, pd.DataFrame):
+        raise SheetReadError(f"예상치 못한 응답 형식: {type(df).__name__}")
+    return df
+
+
+def _read_via_gspread(backend, sheet_url: str, worksheet: str):
+    data = backend.run(sheet_url, worksheet, lambda ws: ws.get_all_records())
+    return pd.DataFrame(data)
+
+
+def _read_paths():
+    """[(이름, 회로 차단기, read(sheet_url, worksheet))]. 스크립트 스레드에서 만들어 fetch에 넘긴다."""
+    paths = []
     # 1) streamlit_gsheets 우선 시도 (secrets에 [connections.gsheets]가 있을 때)
-    if HAS_GSHEETS_CONN and "connections" in st.secrets and "gsheets" in st.secrets["connections"]:
+    connections = get_setting("connections", {})
+    if storage_backend_name() == "gsheets" and hasattr(connections, "get") and connections.get("gsheets") \
+            and _gsheets_connection_type() is not None:
+        conn = st.connection("gsheets", type=_gsheets_connection_type())
+        paths.append(("GSheetsConnection", get_circuit_breaker("GSheetsConnection"),
+                      partial(_read_via_gsheets_connection, conn)))
+    # 2) gspread 서비스 계정 폴백 (secrets에 [gcp_service_account]가 있을 때)
+    paths.append(("gspread", get_circuit_breaker("gspread"),
+                  partial(_read_via_gspread, get_storage_backend("secrets"))))
+    return paths
+
+
+@metrics.instrument("fetch_sheet_df")
+def _fetch_sheet_df(sheet_url: str, worksheet: str, paths):
+    errors = []
+    for name, breaker, read in paths:
         try:
-            conn: GSheetsConnection = st.connection("gsheets", type=GSheetsConnection)
-            df = conn.read(spreadsheet=sheet_url, worksheet=worksheet, ttl=5)
-            if isinstance(df, pd.DataFrame):
-                return df
+            return breaker.call(lambda: with_backoff(lambda: read(sheet_url, worksheet)))
         except Exception as e:
-            errors.append(f"GSheetsConnection 실패: {e}")
+            errors.append(f"{name} 실패: {e}")
+    raise SheetReadError(" | ".join(errors))
+
+
+def read_sheet_df(sheet_url: str, worksheet: str):
+    """시트 → DataFrame. 실패하면 SheetReadError (이전에 받은 값이 있으면 그 값을 돌려줌).
+
+    임의 워크시트를 secrets 인증으로 읽는 범용 경로 (현재 화면에서는 쓰지 않음).
+    발표일정/Q&A 로더와 질문 쓰기 큐는 저장소 백엔드를 get_storage_breakers() + 백오프로 감싸 쓴다.
+    """
+    paths = _read_paths()
+    return cached_sheet_read(("sheet", sheet_url, worksheet),
+                             lambda: _fetch_sheet_df(sheet_url, worksheet, paths), sheet_url, "secrets")
+
+
+@metrics.instrument("fetch_schedule_data")
+def _fetch_schedule_data(sheet_url, backend, breakers):
+    # 공용 클라이언트 풀 (JSON 파일 인증, 프로세스당 1회)
+    data = guarded(breakers, sheet_url, lambda: backend.run(
+        sheet_url, "발표일정", lambda ws: ws.get_all_records()))  # 시트 탭 이름
+    df = pd.DataFrame(data)
+
+    if not df.empty:
+        # 1행이 안내/머릿글인 경우 한 줄 내림(필요한 경우에만)
+        if len(df) > 0 and (df.iloc[0].astype(str) == df.columns).any():
+            df = df.iloc[1:].reset_index(drop=True)
+        if '순번' in df.columns:
+            df['순번'] = pd.to_numeric(df['순번'], errors='coerce').astype('Int64')
+    return df
 
-    # 2) gspread 서비스 계정 폴백 (secrets에 [gcp_service_account]가 있을 때)
-    try:
-        scopes = [
-            "https://www.googleapis.com/auth/spreadsheets",
-            "https://www.googleapis.com/auth/drive",
-        ]
-        creds_dict = st.secrets["gcp_service_account"]  # 없으면 KeyError
-        creds = Credentials.from_service_account_info(creds_dict, scopes=scopes)
-        gc = gspread.authorize(creds)
-        ws = gc.open_by_url(sheet_url).worksheet(worksheet)
-        data = ws.get_all_records()
-        return pd.DataFrame(data)
-    except Exception as e:
-        errors.append(f"gspread 실패: {e}")
-        return " | ".join(errors)
 
-@st.cache_data(ttl=15)
 def load_schedule_data(sheet_url):
     try:
-        scopes = [
-            "https://www.googleapis.com/auth/spreadsheets",
-            "https://www.googleapis.com/auth/drive",
-        ]
-        # JSON 파일에서 바로 로드 (복붙/개행 이슈 없음)
-        creds = Credentials.from_service_account_file(str(SA_PATH), scopes=scopes)
-        gc = gspread.authorize(creds)
-
-        ws = gc.open_by_url(sheet_url).worksheet("발표일정")  # 시트 탭 이름
-        data = ws.get_all_records()
-        df = pd.DataFrame(data)
-
-        if not df.empty:
-            # 1행이 안내/머릿글인 경우 한 줄 내림(필요한 경우에만)
-            if len(df) > 0 and (df.iloc[0].astype(str) == df.columns).any():
-                df = df.iloc[1:].reset_index(drop=True)
-            if '순번' in df.columns:
-                df['순번'] = pd.to_numeric(df['순번'], errors='coerce').astype('Int64')
-        return df
+        backend, breakers = get_storage_backend(), get_storage_breakers()
+        return cached_sheet_read(("schedule", sheet_url),
+                                 lambda: _fetch_schedule_data(sheet_url, backend, breakers), sheet_url)
     except Exception as e:
         return str(e)
-    
 
 
-@st.cache_data(ttl=15)
 def load_qna_data(sheet_url):
     try:
-        scopes = [
-            "https://www.googleapis.com/auth/spreadsheets",
-            "https://www.googleapis.com/auth/drive",
-        ]
-        creds = Credentials.from_service_account_file(str(SA_PATH), scopes=scopes)
-        gc = gspread.authorize(creds)
-
-        ws = gc.open_by_url(sheet_url).worksheet("Questions")
-        data = ws.get_all_records()
-        required = ["Timestamp", "Name", "Question", "Answer"]
-        if not data:
-            return pd.DataFrame(columns=required)
-        df = pd.DataFrame(data)
-        if not all(c in df.columns for c in required):
-            return pd.DataFrame(columns=required)
-        return df
+        # 증분 동기화: 새 행 + Answer 열만 받아 인덱스가 붙은 프로세스 공용 DataFrame에 병합
+        sync = get_qna_sync(sheet_url)
+        return cached_sheet_read(qna_cache_key(sheet_url), sync.refresh, sheet_url)
     except Exception as e:
         return str(e)
 
-    
+
+def show_data_freshness(key):
+    """캐시 값이 오래됐을 때 안내. 갱신 실패 → 경고, 재시작 직후 스냅샷 표시 중 → 캡션."""
+    status = get_sheet_cache().status(key)
+    if not status or not status["as_of"]:
+        return
+    as_of = datetime.fromtimestamp(status["as_of"]).strftime("%m/%d %H:%M:%S")
+    if status["error"]:
+        st.warning(f"구글 시트에 연결하지 못해 {as_of} 기준 데이터를 표시합니다. ({status['error']})")
+    elif status["from_snapshot"]:
+        st.caption(f"저장된 {as_of} 기준 데이터를 먼저 표시합니다. 최신 내용은 곧 반영됩니다.")
+
 
 def save_question_to_gsheet(sheet_url, name, question):
+    """질문을 쓰기 큐(로컬 스풀)에 넣고 바로 반환. 시트 반영은 백그라운드에서 묶어서 처리."""
     try:
-        scopes = [
-            "https://www.googleapis.com/auth/spreadsheets",
-            "https://www.googleapis.com/auth/drive",
-        ]
-        creds = Credentials.from_service_account_file(str(SA_PATH), scopes=scopes)
-        gc = gspread.authorize(creds)
-
-        ws = gc.open_by_url(sheet_url).worksheet("Questions")
-        # 완전 빈 시트일 때만 헤더 생성
-        header = ws.row_values(1) if ws.row_count > 0 else []
-        if header != ["Timestamp", "Name", "Question", "Answer"]:
-            if not ws.get_all_values():
-                ws.append_row(["Timestamp", "Name", "Question", "Answer"])
-
-        from datetime import datetime
-        ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        ws.append_row([ts, name, question, ""])
+        get_write_queue().submit(sheet_url, name, question)
         return True
     except Exception as e:
         st.error(f"질문 저장 실패: {e}")
         return False
-    
-
-
-# --- 스타일이 적용된 HTML 테이블 생성 함수 (사용자님 내용 그대로 유지) ---
-def generate_styled_html_table(df):
-    table_css = """
-    <style>
-        .styled-table { width: 100%; border-collapse: collapse; margin-top: 20px; }
-        .styled-table th, .styled-table td { 
-            border: 1px solid #ccc; padding: 10px; text-align: center; vertical-align: middle;
-            word-break: keep-all; 
-        }
-        .styled-table th { font-weight: bold; }
-        .header-row-1 th { height: 2.5em; padding: 5px; }
-        .student-info-col { }
-        .task-col { width: 4.5%; }
-        .bg-blue { background-color: #dbe5f1 !important; }
-        .bg-green { background-color: #e2efda !important; }
-        .bg-pink { background-color: #f8cbad !important; }
-        .bg-purple { background-color: #e8dff5 !important; }
-    </style>
-    """
-    
-    html = table_css + "<table class='styled-table'>"
-    html += "<thead>"
-    html += '<tr class="header-row-1">'
-    html += '<th class="bg-blue student-info-col" rowspan="2">순번</th>'
-    html += '<th class="bg-blue student-info-col" rowspan="2">학과</th>'
-    html += '<th class="bg-blue student-info-col" rowspan="2">학번</th>'
-    html += '<th class="bg-blue student-info-col" rowspan="2">성명</th>'
-    html += '<th class="bg-green task-col">1</th><th class="bg-green task-col">2</th>'
-    html += '<th class="bg-purple task-col">3</th>'
-    html += '<th class="bg-purple task-col">4</th>'
-    html += '<th class="bg-green task-col">5</th><th class="bg-green task-col">6</th>'
-    html += '<th class="bg-purple task-col">7</th>'
-    html += '<th class="bg-pink task-col bg-purple" rowspan="2">교수1</th>'
-    html += '<th class="bg-green task-col">8</th><th class="bg-green task-col">9</th>'
-    html += '<th class="bg-pink task-col bg-purple" rowspan="2">글쓰기1</th>'
-    html += '<th class="bg-purple task-col">10</th>'
-    html += '<th class="bg-green task-col">11</th>'
-    html += '<th class="bg-pink task-col bg-purple" rowspan="2">교수2</th>'
-    html += '<th class="bg-green task-col">12</th><th class="bg-green task-col">13</th>'
-    html += '<th class="bg-pink task-col bg-purple" rowspan="2">글쓰기2</th>'
-    html += '<th class="bg-green task-col">14</th><th class="bg-green task-col">15</th>'
-    html += "</tr>"
-    html += "<tr>"
-    headers_row2 = { "강의 소개": "강의<br>소개", "논문 작성": "논문<br>작성", "연구 계획서": "연구<br>계획서", "논문 요약": "논문<br>요약", "연구사": "연구사", "1차 사료": "1차<br>사료", "사료 노트": "사료<br>노트", "초고 개요": "초고<br>개요", "초고 작성": "초고<br>작성", "완고 발표": "완고<br>발표" }
-    html += f'<th class="bg-green task-col">{headers_row2["강의 소개"]}</th><th class="bg-green task-col">{headers_row2["논문 작성"]}</th>'
-    html += f'<th class="bg-purple task-col">{headers_row2["연구 계획서"]}</th>'
-    html += f'<th class="bg-purple task-col">{headers_row2["논문 요약"]}</th>'
-    html += f'<th class="bg-green task-col">{headers_row2["연구사"]}</th><th class="bg-green task-col">{headers_row2["연구사"]}</th>'
-    html += f'<th class="bg-purple task-col">{headers_row2["1차 사료"]}</th>'
-    html += f'<th class="bg-green task-col">{headers_row2["사료 노트"]}</th><th class="bg-green task-col">{headers_row2["사료 노트"]}</th>'
-    html += f'<th class="bg-purple task-col">{headers_row2["초고 개요"]}</th>'
-    html += f'<th class="bg-green task-col">{headers_row2["초고 작성"]}</th><th class="bg-green task-col">{headers_row2["초고 작성"]}</th>'
-    html += f'<th class="bg-green task-col">{headers_row2["완고 발표"]}</th><th class="bg-green task-col">{headers_row2["완고 발표"]}</th>'
-    html += f'<th class="bg-green task-col">{headers_row2["완고 발표"]}</th>'
-    html += "</tr></thead>"
-    purple_cols_indices = [6, 7, 10, 11, 14, 15, 17, 20] 
-    html += "<tbody>"
-    for _, row in df.iterrows():
-        html += "<tr>"
-        seq_num = str(row.get('순번', '')) if pd.notna(row.get('순번')) else ''
-        html += f'<td class="bg-blue student-info-col">{seq_num}</td>'
-        html += f'<td class="bg-blue student-info-col">{row.get("학과", "")}</td>'
-        html += f'<td class="bg-blue student-info-col">{row.get("학번", "")}</td>'
-        html += f'<td class="bg-blue student-info-col">{row.get("성명", "")}</td>'
-        for i, col_name in enumerate(df.columns[4:], 4):
-            cell_class = "bg-purple" if i in purple_cols_indices else ""
-            html += f"<td class='task-col {cell_class}'>{row.get(col_name, '')}</td>"
-        html += "</tr>"
-    html += "</tbody></table>"
-    return html
 
 
 # --------------------
 # 웹앱 UI 구성 (사용자님 내용 그대로 유지)
 # --------------------
-st.title(f"🎓 {COURSE_TITLE}")
-st.markdown("---")
+def force_rerun():
+    """Streamlit 버전에 맞춰 안전하게 rerun."""
+    try:
+        import streamlit as st  # 이미 있음
+        st.rerun()  # 신버전
+    except AttributeError:
+        # 구버전 호환 (있을 때만 실행)
+        try:
+            st.experimental_rerun()
+        except Exception:
+            pass
 
-tab1, tab2, tab5, tab3, tab4 = st.tabs([ "**강의 소개**", "**주차별 강의**", "**📢 실시간 발표 일정**", "**자료실**", "**Q&A**" ])
 
-with tab1:
+# --- Tab 1: 강의 소개 ---
+def render_intro():
     st.header("📋 강의 소개")
+    # 강의 목표·방식·평가 방법은 강의 파일(courses/<ID>.toml)의 objectives / method / evaluation
+    objectives = "".join(f"\n    {i}. {text}" for i, text in enumerate(COURSE.objectives, start=1))
+    summary, _, details = COURSE.evaluation.partition("\n")
+    details = "".join(f"\n    {line}" for line in details.splitlines())
     st.markdown(f"""
-    - **과목명:** {COURSE_TITLE} ({COURSE_CODE})
-    - **담당교수:** {PROFESSOR_NAME} ({PROFESSOR_EMAIL})
-    - **강의시간:** {DAY_TIME}
-    - **강의장소:** {CLASSROOM}
-    - **강의 목표:** 
-        1. 역사학 논문 쓰기를 단계별로 진행한다.  
-        2. 연구계획 수립부터 연구사 정리, 사료 정리, 초고 작성, 논문 형식 준수 등 논문 쓰기의 기본을 익힌다.  
-        3. 자신의 연구 주제에 관하여 동료 수강생들과 원활하게 의사 소통한다.  
-    - **강의 방식:** 개인별 프로젝트 수행
-    - **평가 방법:** 출석(10%), 과제(60%), 최종 연구계획서(30%)
-        1. 출석: 수업일수의 1/3을 초과하여 결석하면 성적은 "F" 또는 "U"가 됨  
-           (담당교수가 불가피한 결석으로 인정하는 경우는 예외로 할 수 있음)
-        2. 과제: 
-            - 프로젝트 단계별 수행 여부를 최우선시 함. 
-            - 최초에 개인별로 60점을 부여 -> 단계별로 감정 요건 기준에 해당하면 정해진 점수만큼 감점.
-        3. 최종 연구계획서: 평가기준에 따라 질적 평가""")
-    
+- **과목명:** {COURSE.title} ({COURSE.code})
+- **담당교수:** {COURSE.professor} ({COURSE.email})
+- **강의시간:** {COURSE.day_time}
+- **강의장소:** {COURSE.classroom}
+- **강의 목표:** {objectives}
+- **강의 방식:** {COURSE.method}
+- **평가 방법:** {summary}{details}""")
 
-    st.markdown("---")
-    st.subheader("⚠️ 감점 기준표")
-
-    # 평가표를 위한 HTML 및 CSS 코드 (수정된 부분)
-    grading_table_html = """
-    <style>
-        .grading-table {
-            /* 이 부분을 60%로 수정하고, 가운데 정렬을 추가합니다 */
-            width: 60%;
-            margin: 0 auto; 
-            border-collapse: collapse;
-            margin-top: 20px;
-            font-size: 0.95em;
-        }
-        .grading-table th, .grading-table td {
-            border: 1px solid #cccccc;
-            padding: 10px;
-            text-align: center;
-            vertical-align: middle;
-        }
-        .grading-table th {
-            background-color: #f2f2f2;
-            font-weight: bold;
-        }
-        .grading-table td.left-align {
-            text-align: left;
-        }
-    </style>
-    <table class="grading-table">
-        <thead>
-            <tr>
-                <th>항목</th>
-                <th>감점 요건</th>
-                <th>감점 점수</th>
-                <th>감점 요건 기준</th>
-            </tr>
-        </thead>
-        <tbody>
-            <tr>
-                <td><b>발표</b></td>
-                <td>불이행</td>
-                <td>-5</td>
-                <td class="left-align">정해진 날짜 발표 펑크</td>
-            </tr>
-            <tr>
-                <td><b>면담</b></td>
-                <td>불이행</td>
-                <td>-5</td>
-                <td class="left-align">교수 날인 한 면담지 기한 내 미제출</td>
-            </tr>
-            <tr>
-                <td><b>글쓰기</b></td>
-                <td>기한 내 불이행</td>
-                <td>-5</td>
-                <td class="left-align">글쓰기 지도 받은 기록 기한 내 미제출</td>
-            </tr>
-            <tr>
-                <td rowspan="3"><b>제출</b></td>
-                <td>미제출</td>
-                <td>-4</td>
-                <td class="left-align">수업 시간까지 미제출</td>
-            </tr>
-            <tr>
-                <td>지각</td>
-                <td>-2</td>
-                <td class="left-align">마감 기한 내 미제출</td>
-            </tr>
-            <tr>
-                <td>미비</td>
-                <td>-1</td>
-                <td class="left-align">형식 요건을 갖추지 못함</td>
-            </tr>
-            <tr>
-                <td rowspan="2"><b>출결</b></td>
-                <td>결석</td>
-                <td>-1</td>
-                <td class="left-align">유계 결석은 제외</td>
-            </tr>
-            <tr>
-                <td>지각</td>
-                <td>-0.3</td>
-                <td class="left-align">출석 전체 호명 종료 후 출석</td>
-            </tr>
-            <tr>
-                <td rowspan="4"><b>기말</b></td>
-                <td>미제출</td>
-                <td>F</td>
-                <td class="left-align">성적 마감일까지 제출하지 않은 경우</td>
-            </tr>
-            <tr>
-                <td>지각제출</td>
-                <td>-15</td>
-                <td class="left-align">기한 후 제출한 경우</td>
-            </tr>
-            <tr>
-                <td>형식 미비</td>
-                <td>-10 ~ -5</td>
-                <td class="left-align">주요 항목 최소 1가지 이상 누락 혹은 정해진 규격 기준 분량이 1/2 미만</td>
-            </tr>
-            <tr>
-                <td>내용 미흡</td>
-                <td>-10 ~ -5</td>
-                <td class="left-align">인용 윤리 위반 / 챗지피티 무단 활용 등</td>
-            </tr>
-        </tbody>
-    </table>
-    """
-    st.markdown(grading_table_html, unsafe_allow_html=True)
- 
+    if COURSE.rubric:
+        st.markdown("---")
+        st.subheader("⚠️ 감점 기준표")
+        st.markdown(grading_table_html(COURSE.rubric), unsafe_allow_html=True)
 
 
 # --- Tab 2: 주차별 강의 (세부강의일정 임베드 + 캐시버스터) ---
-with tab2:
+def render_weekly():
     st.header("🗓️ 주차별 강의 계획")
+    if not COURSE.schedule.empty:
+        # 강의 파일의 [schedule] (불러올 때 단계 병합까지 계산해 둔 표)
+        st.markdown(weekly_plan_html(COURSE.schedule), unsafe_allow_html=True)
+        st.subheader("세부 강의 일정")
     st.info("구글 시트 '세부강의일정'을 '웹에 게시(Publish to the web)' 링크로 임베드합니다. 새로고침 버튼은 캐시를 우회합니다.")
 
-    # 1) '웹에 게시'에서 복사한 iframe의 src를 여기에 붙여넣으세요.
-    DETAIL_EMBED_SRC = "https://docs.google.com/spreadsheets/d/e/2PACX-1vR-7ESO9FAkuSbxl0BbqFvtIyVnVi_Rhk7lW2Nf54jQV90p2IaHk_OijM2eSy3R-nLYSSAs3_X7YUQM/pubhtml?gid=0&amp;single=true&amp;widget=true&amp;headers=false"
+    # 1) '웹에 게시'에서 복사한 iframe의 src (courses/<ID>.toml의 detail_embed_src)
+    DETAIL_EMBED_SRC = COURSE.detail_embed_src
     #    ↑ 반드시 /d/e/.../pubhtml?... 형태여야 하며, 편집 URL(/edit...)은 안 됩니다.
+    if not DETAIL_EMBED_SRC:
+        st.info("이 강의의 세부 강의 일정이 아직 등록되지 않았습니다.")
+        return
 
     # 2) HTML 엔티티 정리 (&amp; → &)
     DETAIL_EMBED_SRC = DETAIL_EMBED_SRC.replace("&amp;", "&")
@@ -417,49 +244,120 @@ with tab2:
     st.components.v1.iframe(src, height=h, scrolling=True)
 
 
-def force_rerun():
-    """Streamlit 버전에 맞춰 안전하게 rerun."""
-    try:
-        import streamlit as st  # 이미 있음
-        st.rerun()  # 신버전
-    except AttributeError:
-        # 구버전 호환 (있을 때만 실행)
-        try:
-            st.experimental_rerun()
-        except Exception:
-            pass
-
-
-
-# --- Tab 5: 실시간 발표 일정 (임베드 + 캐시버스터) ---
-with tab5:
+# --- Tab 5: 실시간 발표 일정 (서버 렌더링 표, 실패 시 임베드 + 캐시버스터) ---
+def render_live_schedule():
     st.header("📢 실시간 발표 일정")
-    st.info("구글 시트 ‘발표일정’을 '웹에 게시' 링크로 임베드합니다. (원본 스타일, 약간의 반영 지연 가능)")
-
-    # '웹에 게시' → iframe 코드의 src를 그대로 붙여넣으세요.
-    LIVE_EMBED_SRC = "https://docs.google.com/spreadsheets/d/e/2PACX-1vR-7ESO9FAkuSbxl0BbqFvtIyVnVi_Rhk7lW2Nf54jQV90p2IaHk_OijM2eSy3R-nLYSSAs3_X7YUQM/pubhtml?gid=1293592544&amp;single=true&amp;widget=true&amp;headers=false"
-    LIVE_EMBED_SRC = LIVE_EMBED_SRC.replace("&amp;", "&")  # &amp; → &
-
-    if "live_nonce" not in st.session_state:
-        st.session_state.live_nonce = 0
-    colA, colB = st.columns([1, 1])
-    with colA:
-        if st.button("🔄 새로고침(임베드)"):
-            st.session_state.live_nonce += 1   # 캐시버스터
-    with colB:
-        st.link_button("🗗 새 창에서 열기", LIVE_EMBED_SRC)
-
-    src = f"{LIVE_EMBED_SRC}&t={st.session_state.live_nonce}"
-    st.components.v1.iframe(src, height=900, scrolling=True)
 
+    # '웹에 게시' → iframe 코드의 src (courses/<ID>.toml의 live_embed_src)
+    LIVE_EMBED_SRC = COURSE.live_embed_src.replace("&amp;", "&")  # &amp; → &
+
+    # 기본 표 모드는 편집 URL(/d/<id>/edit)이 필요 → 강의 파일 또는 secrets의 schedule_sheet_url
+    schedule_sheet_url = COURSE.schedule_url()
+    view_modes = ["기본 표 (빠름)", "구글 시트 임베드"]
+    view_mode = st.radio("보기 방식", view_modes, index=0 if schedule_sheet_url else 1,
+                         horizontal=True, key="live_view_mode")
+
+    schedule_result = None
+    if view_mode == view_modes[0]:
+        if schedule_sheet_url:
+            schedule_result = load_schedule_data(schedule_sheet_url)
+        if not isinstance(schedule_result, pd.DataFrame):
+            st.warning("발표일정을 직접 불러오지 못해 임베드로 표시합니다."
+                       + (f" ({schedule_result})" if schedule_result else " (schedule_sheet_url 미설정)"))
+
+    if isinstance(schedule_result, pd.DataFrame):
+        show_data_freshness(("schedule", schedule_sheet_url))
+        st.info("구글 시트 ‘발표일정’을 서버에서 읽어 표로 보여줍니다. (15초 간격 갱신, 내용이 바뀐 경우에만 다시 그림)")
+        st.link_button("🗗 원본 시트 새 창에서 열기", LIVE_EMBED_SRC)
+        if schedule_result.empty:
+            st.success("아직 등록된 발표 일정이 없습니다.")
+        else:
+            # 총점은 강의 파일에 [grading]이 있을 때만
+            totals = get_grade_engine(COURSE.id).totals(schedule_result) if COURSE.grading else None
+            st.markdown(generate_styled_html_table(schedule_result, totals, COURSE.grading), unsafe_allow_html=True)
+    elif not LIVE_EMBED_SRC:
+        st.info("이 강의의 발표 일정 시트가 아직 설정되지 않았습니다.")
+    else:
+        st.info("구글 시트 ‘발표일정’을 '웹에 게시' 링크로 임베드합니다. (원본 스타일, 약간의 반영 지연 가능)")
+        if "live_nonce" not in st.session_state:
+            st.session_state.live_nonce = 0
+        colA, colB = st.columns([1, 1])
+        with colA:
+            if st.button("🔄 새로고침(임베드)"):
+                st.session_state.live_nonce += 1   # 캐시버스터
+        with colB:
+            st.link_button("🗗 새 창에서 열기", LIVE_EMBED_SRC)
+
+        src = f"{LIVE_EMBED_SRC}&t={st.session_state.live_nonce}"
+        st.components.v1.iframe(src, height=900, scrolling=True)
+
+
+
+
+
+# --- Tab 3: 자료실 (로컬 자료 디렉터리, 썸네일은 내용 해시로 미리 만들어 둔 파일) ---
+def render_materials():
+    st.header("📚 자료실")
+    index = get_material_index(COURSE.materials_dir)
+    materials = index.materials()
+    if not materials:
+        if index.building:
+            # 첫 색인(해시·썸네일)은 백그라운드에서 만드는 중: 끝나면 프래그먼트가 다시 그림
+            st.info("강의 자료 목록을 만드는 중입니다. 잠시 후 자동으로 표시됩니다.")
+            wait_for_materials(COURSE.materials_dir)
+        else:
+            st.info("강의 자료를 준비 중입니다.")
+        return
+
+    preview = next((m for m in materials if m.sha256 == st.session_state.get("material_preview")), None)
+    if preview is not None and preview.web is not None:
+        st.image(str(preview.web), caption=preview.name)
+        if st.button("미리보기 닫기", key="material_preview_close"):
+            st.session_state.material_preview = None
+            force_rerun()
+        st.markdown("---")
+
+    cols = st.columns(3)
+    for i, m in enumerate(materials):
+        with cols[i % 3]:
+            with st.container(border=True):
+                if m.thumb is not None:
+                    st.image(str(m.thumb), width="stretch")
+                st.markdown(f"**{m.name}**")
+                st.caption(f"{format_size(m.size)} · {datetime.fromtimestamp(m.mtime):%Y-%m-%d %H:%M}")
+                if m.web is not None and st.button("🔍 크게 보기", key=f"material_view_{m.sha256}"):
+                    st.session_state.material_preview = m.sha256
+                    force_rerun()
+                # 큰 파일은 정적 파일 경로로 (rerun마다 바이트를 읽지 않음). 정적 서빙이 꺼져 있으면
+                # '다운로드 준비'를 누른 세션에서만 읽어 옴. 작은 파일은 공용 LRU에서 바로
+                ready = st.session_state.setdefault("materials_ready", set())
+                if m.size > INLINE_DOWNLOAD_MAX_BYTES and st.get_option("server.enableStaticServing"):
+                    st.markdown(f'<a href="{index.static_url(m)}" download="{html.escape(m.name)}">⬇️ 다운로드</a>',
+                                unsafe_allow_html=True)
+                elif m.size > INLINE_DOWNLOAD_MAX_BYTES and m.sha256 not in ready:
+                    if st.button("⬇️ 다운로드 준비", key=f"material_prep_{m.sha256}"):
+                        ready.add(m.sha256)
+                        force_rerun()
+                else:
+                    st.download_button("⬇️ 다운로드", index.download_bytes(m), file_name=m.name, mime=m.mime,
+                                       key=f"material_dl_{m.sha256}", on_click="ignore")
 
 
+@st.fragment(run_every=1)
+def wait_for_materials(directory):
+    """자료실 색인이 끝나면 전체 rerun."""
+    if not get_material_index(directory).building:
+        st.rerun()
 
 
-with tab4:
+# --- Tab 4: Q&A ---
+def render_qna():
     st.header("🙋 질의응답 (Q&A)")
     st.info("강의 내용에 대해 궁금한 점을 자유롭게 질문하세요. 제출된 질문은 아래 목록에 나타납니다.")
-    qna_sheet_url = "https://docs.google.com/spreadsheets/d/1Z7pzDbXWjQ0vZnz9sWI0ln6zUtAqWaENKCQxGACrQtU/edit?usp=sharing"
+    qna_sheet_url = COURSE.qna_sheet_url
+    if not qna_sheet_url:
+        st.info("이 강의의 Q&A 시트가 아직 설정되지 않았습니다.")
+        return
     with st.form("question_form", clear_on_submit=True):
         student_name = st.text_input("이름 (선택사항, 익명으로 제출 시 비워두세요)")
         question_text = st.text_area("질문 내용 (필수)")
@@ -471,19 +369,155 @@ with tab4:
                 name_to_save = student_name if student_name else "익명"
                 success = save_question_to_gsheet(qna_sheet_url, name_to_save, question_text)
                 if success:
-                    st.success("질문이 성공적으로 제출되었습니다! 아래 목록에서 확인하세요.")
-                    st.cache_data.clear()
+                    st.success("질문이 접수되었습니다! 시트 동기화 전까지 아래 목록에 '동기화 대기 중'으로 표시됩니다.")
     st.markdown("---")
     st.header("📜 제출된 질문 목록")
+    # 아직 시트에 반영되지 않은 질문 (쓰기 큐 스풀)
+    pending = get_write_queue().pending_rows(qna_sheet_url)
+    for ts, name, question, _ in reversed(pending):
+        with st.expander(f"**Q: {question}** (작성자: {name}, 시간: {ts}) ⏳ 동기화 대기 중"):
+            st.info("시트에 반영되는 중입니다. 잠시 후 답변 목록에 나타납니다.")
     qna_result = load_qna_data(qna_sheet_url)
+    if isinstance(qna_result, pd.DataFrame):
+        show_data_freshness(qna_cache_key(qna_sheet_url))
     if isinstance(qna_result, pd.DataFrame) and not qna_result.empty:
-        qna_result = qna_result.sort_index(ascending=False)
-        for index, row in qna_result.iterrows():
-            with st.expander(f"**Q: {row['Question']}** (작성자: {row['Name']}, 시간: {row['Timestamp']})"):
-                if row['Answer']:
-                    st.markdown(f"**A:** {row['Answer']}")
+        # 검색/필터 (서버 측, 미리 만든 소문자 인덱스 사용)
+        f1, f2, f3, f4 = st.columns([2, 3, 1.3, 1])
+        with f1:
+            q_name = st.text_input("작성자 검색", key="qna_name")
+        with f2:
+            q_text = st.text_input("질문/답변 검색", key="qna_text")
+        with f3:
+            q_unanswered = st.checkbox("미답변만 보기", key="qna_unanswered")
+        with f4:
+            page_size = st.selectbox("표시 개수", QNA_PAGE_SIZES, key="qna_page_size")
+
+        # 필터가 바뀌면 처음 페이지부터
+        filter_key = (q_name, q_text, q_unanswered, page_size)
+        if st.session_state.get("qna_filter_key") != filter_key:
+            st.session_state.qna_filter_key = filter_key
+            st.session_state.qna_shown = page_size
+
+        filtered = filter_qna(qna_result, q_name, q_text, q_unanswered).sort_index(ascending=False)
+        shown = st.session_state.qna_shown
+        st.caption(f"전체 {len(qna_result)}개 중 {len(filtered)}개 일치, {min(shown, len(filtered))}개 표시"
+                   f" · {QNA_POLL_INTERVAL_S:g}초마다 새 답변 확인")
+
+        # 현재 페이지 분량만 위젯으로 렌더링
+        metrics.incr("rows_rendered", min(shown, len(filtered)), view="qna_list")
+        for row in filtered.head(shown).itertuples(index=False):
+            with st.expander(f"**Q: {row.Question}** (작성자: {row.Name}, 시간: {row.Timestamp})"):
+                if row.Answer:
+                    st.markdown(f"**A:** {row.Answer}")
                 else:
                     st.info("아직 답변이 등록되지 않았습니다.")
+        if shown < len(filtered):
+            if st.button("더 보기", key="qna_more"):
+                st.session_state.qna_shown += page_size
+                force_rerun()
+    elif not isinstance(qna_result, pd.DataFrame):
+        # 시트 연결 실패 + 보여 줄 이전 값(캐시/스냅샷)도 없음: '질문 없음'으로 보이지 않게
+        st.error(f"질문 목록을 불러오지 못했습니다. 잠시 후 다시 확인해 주세요. ({qna_result})")
+        if pending:
+            st.caption("위의 '동기화 대기 중' 질문은 안전하게 저장되어 있으며 연결이 회복되면 반영됩니다.")
     else:
         st.success("아직 제출된 질문이 없습니다. 첫 번째 질문을 남겨보세요!")
 
+    # 지금 그린 목록의 버전을 기억해 두고, 이후에는 프래그먼트가 토큰만 비교
+    st.session_state.qna_version = qna_list_version(qna_result, pending)
+    poll_qna_updates(qna_sheet_url)
+
+
+def qna_list_version(qna_result, pending_rows):
+    """Q&A 목록 버전 토큰: (행 수, Answer 열 해시) + 동기화 대기 중인 질문 수."""
+    data_version = qna_version(qna_result) if isinstance(qna_result, pd.DataFrame) else None
+    return data_version, len(pending_rows)
+
+
+@st.fragment(run_every=QNA_POLL_INTERVAL_S)
+def poll_qna_updates(sheet_url):
+    """버전 토큰만 확인하는 작은 프래그먼트. 바뀐 경우에만 전체 rerun (선택된 섹션만 다시 그림).
+
+    시트는 공용 캐시를 거치므로 여러 브라우저가 열려 있어도 TTL마다 변경 신호 조회 한 번뿐.
+    """
+    version = qna_list_version(load_qna_data(sheet_url), get_write_queue().pending_rows(sheet_url))
+    if version == st.session_state.get("qna_version"):
+        metrics.incr("qna_poll", result="unchanged")
+        return
+    metrics.incr("qna_poll", result="changed")
+    st.session_state.qna_version = version
+    st.rerun()
+
+
+# --- 관리자: 계측 패널 (secrets의 admin_token과 같은 ?admin= 쿼리로만 노출) ---
+def is_admin():
+    token = get_setting("admin_token", "")
+    return bool(token) and st.query_params.get("admin") == token
+
+
+def render_metrics():
+    st.header("🛠 계측")
+    if not metrics.ENABLED:
+        st.warning("계측이 꺼져 있습니다. secrets에 metrics_enabled = true (또는 METRICS_ENABLED=1)로 켜세요.")
+
+    timings, counters = metrics.snapshot()
+    st.subheader("타이밍")
+    st.dataframe(pd.DataFrame(timings), width="stretch", hide_index=True)
+    st.subheader("카운터")
+    st.dataframe(pd.DataFrame(counters), width="stretch", hide_index=True)
+
+    cache_stats = get_sheet_cache().stats()
+    backend_stats = get_storage_backend().stats()
+    st.subheader("캐시 / 백엔드")
+    breakers = {name: get_circuit_breaker(name).stats() for name in ("GSheetsConnection", "gspread")}
+    breakers.update(get_storage_breakers().stats())
+    st.json({"sheet_cache": cache_stats, storage_backend_name(): backend_stats, "circuit_breakers": breakers,
+             "materials": get_material_index(COURSE.materials_dir).stats(), "course_errors": course_errors(),
+             "grading": get_grade_engine(COURSE.id).stats() if COURSE.grading else None})
+
+    prom = metrics.prometheus_text({
+        "sheet_cache_stat": {(("stat", k),): v for k, v in cache_stats.items()},
+        "storage_backend_stat": {(("backend", storage_backend_name()), ("stat", k)): v
+                                 for k, v in backend_stats.items()},
+        "circuit_breaker_open": {(("backend", n),): int(b["state"] != "closed") for n, b in breakers.items()},
+    })
+    st.subheader("Prometheus 텍스트")
+    st.download_button("⬇️ metrics.txt", prom, file_name="metrics.txt", mime="text/plain")
+    st.code(prom, language="text")
+    if st.button("계측 초기화"):
+        metrics.reset()
+        force_rerun()
+
+
+# --------------------
+# 섹션 전환: 선택된 섹션 본문만 실행 (기본). nav_mode="tabs"이면 기존 st.tabs 방식.
+# --------------------
+SECTIONS = {
+    "**강의 소개**": render_intro,
+    "**주차별 강의**": render_weekly,
+    "**📢 실시간 발표 일정**": render_live_schedule,
+    "**자료실**": render_materials,
+    "**Q&A**": render_qna,
+}
+if is_admin():
+    SECTIONS["**🛠 계측**"] = render_metrics
+
+st.title(f"🎓 {COURSE.title}")
+if not COURSE_FOUND:
+    course_error = course_errors().get(st.query_params.get("course"))
+    if course_error:
+        st.warning(f"강의 정의 파일을 읽지 못해 기본 강의를 표시합니다. ({course_error})")
+    else:
+        st.warning(f"'{st.query_params.get('course')}' 강의를 찾을 수 없어 기본 강의를 표시합니다.")
+st.markdown("---")
+
+if get_setting("nav_mode", "lazy") == "tabs":
+    # st.tabs는 숨겨진 탭까지 매 rerun마다 모두 실행됨
+    for tab, render in zip(st.tabs(list(SECTIONS)), SECTIONS.values()):
+        with tab, metrics.span("render_section", section=render.__name__, course=COURSE.id):
+            render()
+else:
+    active_section = st.radio("섹션", list(SECTIONS), horizontal=True,
+                              label_visibility="collapsed", key="active_section")
+    with metrics.span("render_section", section=SECTIONS[active_section].__name__, course=COURSE.id):
+        SECTIONS[active_section]()
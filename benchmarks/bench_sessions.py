@@ -0,0 +1,205 @@
+"""동시 접속 세션 부하 테스트.
+
+Streamlit AppTest로 app.py 세션 N개를 한 프로세스에서 동시에 띄운다. 각 세션은 섹션 전환,
+주차별 강의 높이 슬라이더 조작, Q&A 질문 제출을 반복한다. 시트는 로컬 백엔드
+(storage.LocalSheetsBackend)를 쓰며 호출마다 지연을 넣는다.
+
+rerun 지연 p50/p95/p99, 세션당 시트 API 호출 수, 세션당 메모리를 출력하고
+benchmarks/baseline_sessions.json과 비교한다.
+
+    python benchmarks/bench_sessions.py                    # 측정 + 기준선 비교 (회귀 시 exit 1)
+    python benchmarks/bench_sessions.py --update-baseline  # 기준선 갱신
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline_sessions.json"
+
+SCHEDULE_URL = "https://docs.google.com/spreadsheets/d/bench-schedule/edit"
+QNA_URL = "https://docs.google.com/spreadsheets/d/bench-qna/edit"
+# 강의 정의는 이 파일을 복사하되 시트 URL만 위의 가짜 URL로 바꿔 씀 (실제 시트 키로 스냅샷/데이터를 남기지 않도록)
+BENCH_COURSE = ROOT / "courses" / "history-thesis-1.toml"
+
+# 기준선 대비 허용 폭 (이보다 나빠지면 회귀)
+TOLERANCE = {
+    "rerun_p50_ms": 1.5,
+    "rerun_p95_ms": 1.5,
+    "rerun_p99_ms": 2.0,
+    "sheet_calls_per_session": 1.25,
+    "memory_per_session_kb": 1.5,
+    "table_render_3000_ms": 1.5,
+}
+
+
+def write_bench_course(courses_dir: Path) -> Path:
+    """BENCH_COURSE를 복사하면서 Q&A/발표일정 시트 URL을 벤치마크용 가짜 URL로 바꿈."""
+    text = BENCH_COURSE.read_text(encoding="utf-8")
+    for key, url in (("qna_sheet_url", QNA_URL), ("schedule_sheet_url", SCHEDULE_URL)):
+        text, n = re.subn(rf"^{key} = .*$", f"{key} = {json.dumps(url)}", text, flags=re.M)
+        if n != 1:
+            raise RuntimeError(f"{BENCH_COURSE}에서 {key}를 찾지 못함")
+    courses_dir.mkdir(parents=True, exist_ok=True)
+    path = courses_dir / BENCH_COURSE.name
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def configure_env(workdir: Path, latency_ms: float):
+    """app.py를 불러오기 전에 로컬 백엔드/스풀/스냅샷/자료실 파생 이미지/강의 정의 경로를 모두 workdir 아래로 지정."""
+    write_bench_course(workdir / "courses")
+    os.environ.update(
+        STORAGE_BACKEND="local",
+        LOCAL_SHEETS_PATH=str(workdir / "sheets.sqlite3"),
+        LOCAL_SHEETS_LATENCY_MS=str(latency_ms),
+        QNA_SPOOL_PATH=str(workdir / "spool.sqlite3"),
+        SNAPSHOT_DIR=str(workdir / "snapshots"),
+        MATERIALS_CACHE_DIR=str(workdir / "materials"),
+        COURSES_DIR=str(workdir / "courses"),
+        SCHEDULE_SHEET_URL=SCHEDULE_URL,
+    )
+    sys.path.insert(0, str(ROOT))
+    sys.path.insert(0, str(ROOT / "benchmarks"))
+
+
+def seed(roster_rows: int, questions: int):
+    from bench_table import make_roster
+    from storage import get_local_backend
+
+    backend = get_local_backend()
+    roster = make_roster(roster_rows)
+    backend.seed(SCHEDULE_URL, "발표일정", [list(roster.columns)] + roster.astype(str).values.tolist())
+    qna = [["Timestamp", "Name", "Question", "Answer"]]
+    qna += [[f"2025-09-{i % 28 + 1:02d} 10:00:00", f"학생{i}", f"질문 {i}", "답변" if i % 2 else ""]
+            for i in range(questions)]
+    backend.seed(QNA_URL, "Questions", qna)
+    return backend
+
+
+def session_steps(idx: int, iterations: int, latencies: list[float], errors: list[str], keep: list):
+    """세션 하나의 시나리오. rerun 하나마다 yield 해서 다른 세션과 번갈아 실행되게 한다."""
+    from streamlit.testing.v1 import AppTest
+
+    def timed(at):
+        t0 = time.perf_counter()
+        at.run()
+        latencies.append((time.perf_counter() - t0) * 1000)
+        if at.exception:
+            errors.append(f"세션 {idx}: {at.exception[0].message}")
+
+    at = AppTest.from_file(str(ROOT / "app.py"), default_timeout=120)
+    keep.append(at)
+    timed(at)
+    yield
+    for it in range(iterations):
+        for section in at.radio(key="active_section").options:
+            at.radio(key="active_section").set_value(section)
+            timed(at)
+            yield
+            if section == "**주차별 강의**":
+                at.slider[0].set_value(600 + 50 * ((idx + it) % 12))
+                timed(at)
+                yield
+            elif section == "**Q&A**":
+                at.text_area[0].input(f"부하 테스트 질문 {idx}-{it}")
+                at.button[0].click()
+                timed(at)
+                yield
+
+
+def percentile(values: list[float], q: float) -> float:
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1]
+
+
+def measure_table_render() -> float:
+    import timeit
+
+    from bench_table import make_roster
+    from tables import render_table_body
+
+    df = make_roster(3000)
+    return min(timeit.repeat(lambda: render_table_body(df), number=1, repeat=5)) * 1000
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--iterations", type=int, default=2)
+    parser.add_argument("--latency-ms", type=float, default=50, help="로컬 시트 호출마다 넣는 지연")
+    parser.add_argument("--roster-rows", type=int, default=30)
+    parser.add_argument("--questions", type=int, default=300)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로만 출력")
+    args = parser.parse_args(argv)
+
+    workdir = Path(tempfile.mkdtemp(prefix="bench-sessions-"))
+    configure_env(workdir, args.latency_ms)
+    backend = seed(args.roster_rows, args.questions)
+    calls_before = sum(backend.stats()[k] for k in ("read", "write", "metadata"))
+
+    latencies: list[float] = []
+    errors: list[str] = []
+    keep: list = []
+    tracemalloc.start()
+    mem_before = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    # AppTest는 한 프로세스에서 동시에 run() 할 수 없으므로 세션들을 rerun 단위로 번갈아 실행.
+    # 캐시/클라이언트 풀/쓰기 큐는 실제 서버처럼 모든 세션이 공유하고, 백그라운드 스레드는 병행 동작.
+    sessions = [session_steps(i, args.iterations, latencies, errors, keep) for i in range(args.sessions)]
+    while sessions:
+        for steps in list(sessions):
+            if next(steps, StopIteration) is StopIteration:
+                sessions.remove(steps)
+    wall = time.perf_counter() - started
+    mem_after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    calls = sum(backend.stats()[k] for k in ("read", "write", "metadata")) - calls_before
+    result = {
+        "sessions": args.sessions,
+        "reruns": len(latencies),
+        "wall_s": round(wall, 2),
+        "rerun_p50_ms": round(percentile(latencies, 50), 1),
+        "rerun_p95_ms": round(percentile(latencies, 95), 1),
+        "rerun_p99_ms": round(percentile(latencies, 99), 1),
+        "sheet_calls_per_session": round(calls / args.sessions, 2),
+        "memory_per_session_kb": round((mem_after - mem_before) / 1024 / args.sessions, 1),
+        "table_render_3000_ms": round(measure_table_render(), 1),
+        "errors": len(errors),
+    }
+
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    else:
+        for k, v in result.items():
+            print(f"{k:>26}: {v}")
+        for e in errors[:5]:
+            print("  !", e)
+
+    if args.update_baseline:
+        BASELINE_PATH.write_text(json.dumps(result, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        print(f"기준선 저장: {BASELINE_PATH}")
+        return 0
+
+    failed = bool(errors)
+    if BASELINE_PATH.exists():
+        baseline = json.loads(BASELINE_PATH.read_text(encoding="utf-8"))
+        for key, factor in TOLERANCE.items():
+            if key in baseline and result[key] > baseline[key] * factor:
+                print(f"회귀: {key} {result[key]} > 기준 {baseline[key]} × {factor}")
+                failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""콜드 스타트 측정.
+
+1. import 비용: 새 프로세스에서 `python -X importtime`으로 app.py를 불러와 최상위 모듈별
+   누적 import 시간을 정리한다 (benchmarks/startup_importtime.txt).
+2. 첫 화면까지 시간: 새 프로세스에서 AppTest로 app.py를 한 번 실행(기본 섹션 '강의 소개')하고
+   프로세스 시작부터 첫 실행이 끝날 때까지를 잰다. 여러 번 재서 중앙값을 목표와 비교한다.
+
+첫 화면에서는 시트를 쓰지 않으므로 gspread / google-auth / pyarrow가 불려 오면 실패로 본다.
+
+    python benchmarks/bench_startup.py                  # 측정 + 목표 비교 (초과 시 exit 1)
+    python benchmarks/bench_startup.py --update-report  # importtime 보고서 갱신
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+REPORT_PATH = Path(__file__).resolve().parent / "startup_importtime.txt"
+
+# 프로세스 시작 → 첫 섹션 렌더링 완료 목표 (중앙값)
+COLD_START_TARGET_MS = 1500
+# 첫 화면에 필요 없는 무거운 모듈: 시트를 처음 읽을 때까지 import 되면 안 됨
+DEFERRED_MODULES = ["gspread", "google.oauth2", "google.auth.transport.requests", "streamlit_gsheets",
+                    "pyarrow.parquet"]
+
+_FIRST_PAINT = """
+import json, logging, sys, time
+t0 = time.perf_counter()
+logging.disable(logging.WARNING)
+sys.path.insert(0, {root!r})
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({app!r}, default_timeout=60).run()
+elapsed = (time.perf_counter() - t0) * 1000
+print(json.dumps({{"first_paint_ms": elapsed, "ok": not at.exception and bool(at.header),
+                  "loaded": [m for m in {deferred!r} if m in sys.modules]}}))
+"""
+
+
+def _env() -> dict:
+    # 계측 코드는 끄고 .pyc는 남기지 않음 (측정은 캐시된 바이트코드 기준)
+    return {**os.environ, "METRICS_ENABLED": "false", "PYTHONDONTWRITEBYTECODE": "1"}
+
+
+def import_report(top: int = 25) -> tuple[float, list[tuple[str, float]]]:
+    """(app 전체 import ms, [(최상위 모듈, 누적 ms)] 큰 순)."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import logging; logging.disable(logging.WARNING); import app"],
+        cwd=ROOT, env=_env(), capture_output=True, text=True, check=True,
+    )
+    total = 0.0
+    children: list[tuple[str, float]] = []
+    by_top: dict[str, float] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        # "import time:  self [us] | cumulative [us] | <2칸 들여쓰기 × 깊이>모듈" — 자식이 부모보다 먼저 나온다
+        _, cumulative, name = line[len("import time:"):].split("|")
+        name = name[1:]
+        depth = (len(name) - len(name.lstrip(" "))) // 2
+        name, ms = name.strip(), int(cumulative) / 1000
+        if depth == 1:
+            children.append((name.split(".")[0], ms))
+        elif depth == 0:
+            if name == "app":
+                # app.py가 직접 (또는 처음으로) 불러온 모듈만 집계
+                total = ms
+                for top_name, child_ms in children:
+                    by_top[top_name] = by_top.get(top_name, 0.0) + child_ms
+            children = []
+    return total, sorted(by_top.items(), key=lambda kv: -kv[1])[:top]
+
+
+def first_paint(runs: int) -> tuple[list[float], list[str], bool]:
+    code = _FIRST_PAINT.format(root=str(ROOT), app=str(ROOT / "app.py"), deferred=DEFERRED_MODULES)
+    times, loaded, ok = [], set(), True
+    for _ in range(runs):
+        proc = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=_env(),
+                              capture_output=True, text=True, check=True)
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        times.append(result["first_paint_ms"])
+        loaded.update(result["loaded"])
+        ok = ok and result["ok"]
+    return times, sorted(loaded), ok
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--update-report", action="store_true")
+    args = parser.parse_args(argv)
+
+    total, top = import_report()
+    times, loaded, ok = first_paint(args.runs)
+    median = statistics.median(times)
+
+    lines = [f"# python -X importtime -c 'import app' (Python {sys.version.split()[0]})",
+             f"app 전체 import: {total:.1f} ms", "", "최상위 모듈별 누적 import (ms):"]
+    lines += [f"  {name:<28} {ms:8.1f}" for name, ms in top]
+    lines += ["", f"첫 화면까지 (프로세스 시작 → '강의 소개' 렌더링, {args.runs}회): "
+                  f"중앙값 {median:.0f} ms, 최소 {min(times):.0f} ms / 목표 {COLD_START_TARGET_MS} ms",
+              f"첫 화면 후 불려 온 지연 대상 모듈: {', '.join(loaded) or '없음'}"]
+    report = "\n".join(lines) + "\n"
+    print(report, end="")
+
+    if args.update_report:
+        REPORT_PATH.write_text(report, encoding="utf-8")
+        print(f"보고서 저장: {REPORT_PATH}")
+
+    failed = False
+    if not ok:
+        print("실패: 첫 실행에서 예외가 났거나 화면이 비어 있음")
+        failed = True
+    if loaded:
+        print(f"실패: 첫 화면에서 지연 대상 모듈을 불러옴 ({', '.join(loaded)})")
+        failed = True
+    if median > COLD_START_TARGET_MS:
+        print(f"실패: 첫 화면까지 {median:.0f} ms > 목표 {COLD_START_TARGET_MS} ms")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
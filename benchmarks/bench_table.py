@@ -0,0 +1,152 @@
+"""발표일정 표 HTML 생성 마이크로 벤치마크.
+
+기존 iterrows 구현과 tables.generate_styled_html_table(열 단위 + 해시 캐시)을
+30 / 300 / 3,000행에서 비교한다. 감점 엔진(grading.GradeEngine)의 전체 계산과
+셀 두 개만 바뀐 뒤의 증분 계산도 함께 잰다.
+
+    python benchmarks/bench_table.py
+"""
+from __future__ import annotations
+
+import sys
+import time
+import timeit
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from courses import Course  # noqa: E402
+from grading import GradeEngine  # noqa: E402
+from tables import generate_styled_html_table, render_table_body  # noqa: E402
+
+# 표 머리글과 감점 규칙은 배포된 강의 파일 것을 그대로
+RULES = Course.from_file(Path(__file__).resolve().parent.parent / "courses" / "history-thesis-1.toml").grading
+
+ROW_COUNTS = [30, 300, 3000]
+TASK_COLUMNS = 19  # 과제 15 + 교수/글쓰기 4
+STATUSES = ["O", "미제출", "지각", "미비", "", "결석"]
+
+
+def make_roster(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    data = {
+        "순번": pd.array(np.arange(1, n_rows + 1), dtype="Int64"),
+        "학과": rng.choice(["국사학과", "동양사학과", "서양사학과"], n_rows),
+        "학번": [f"2025-{i:05d}" for i in range(n_rows)],
+        "성명": [f"학생{i}" for i in range(n_rows)],
+    }
+    for j in range(TASK_COLUMNS):
+        data[f"과제{j + 1}"] = rng.choice(STATUSES, n_rows)
+    return pd.DataFrame(data)
+
+
+def legacy_generate_styled_html_table(df):
+    """app.py에 있던 기존 구현 (iterrows + html +=), 비교용으로 그대로 보존."""
+    table_css = """
+    <style>
+        .styled-table { width: 100%; border-collapse: collapse; margin-top: 20px; }
+        .styled-table th, .styled-table td { 
+            border: 1px solid #ccc; padding: 10px; text-align: center; vertical-align: middle;
+            word-break: keep-all; 
+        }
+        .styled-table th { font-weight: bold; }
+        .header-row-1 th { height: 2.5em; padding: 5px; }
+        .student-info-col { }
+        .task-col { width: 4.5%; }
+        .bg-blue { background-color: #dbe5f1 !important; }
+        .bg-green { background-color: #e2efda !important; }
+        .bg-pink { background-color: #f8cbad !important; }
+        .bg-purple { background-color: #e8dff5 !important; }
+    </style>
+    """
+    
+    html = table_css + "<table class='styled-table'>"
+    html += "<thead>"
+    html += '<tr class="header-row-1">'
+    html += '<th class="bg-blue student-info-col" rowspan="2">순번</th>'
+    html += '<th class="bg-blue student-info-col" rowspan="2">학과</th>'
+    html += '<th class="bg-blue student-info-col" rowspan="2">학번</th>'
+    html += '<th class="bg-blue student-info-col" rowspan="2">성명</th>'
+    html += '<th class="bg-green task-col">1</th><th class="bg-green task-col">2</th>'
+    html += '<th class="bg-purple task-col">3</th>'
+    html += '<th class="bg-purple task-col">4</th>'
+    html += '<th class="bg-green task-col">5</th><th class="bg-green task-col">6</th>'
+    html += '<th class="bg-purple task-col">7</th>'
+    html += '<th class="bg-pink task-col bg-purple" rowspan="2">교수1</th>'
+    html += '<th class="bg-green task-col">8</th><th class="bg-green task-col">9</th>'
+    html += '<th class="bg-pink task-col bg-purple" rowspan="2">글쓰기1</th>'
+    html += '<th class="bg-purple task-col">10</th>'
+    html += '<th class="bg-green task-col">11</th>'
+    html += '<th class="bg-pink task-col bg-purple" rowspan="2">교수2</th>'
+    html += '<th class="bg-green task-col">12</th><th class="bg-green task-col">13</th>'
+    html += '<th class="bg-pink task-col bg-purple" rowspan="2">글쓰기2</th>'
+    html += '<th class="bg-green task-col">14</th><th class="bg-green task-col">15</th>'
+    html += "</tr>"
+    html += "<tr>"
+    headers_row2 = { "강의 소개": "강의<br>소개", "논문 작성": "논문<br>작성", "연구 계획서": "연구<br>계획서", "논문 요약": "논문<br>요약", "연구사": "연구사", "1차 사료": "1차<br>사료", "사료 노트": "사료<br>노트", "초고 개요": "초고<br>개요", "초고 작성": "초고<br>작성", "완고 발표": "완고<br>발표" }
+    html += f'<th class="bg-green task-col">{headers_row2["강의 소개"]}</th><th class="bg-green task-col">{headers_row2["논문 작성"]}</th>'
+    html += f'<th class="bg-purple task-col">{headers_row2["연구 계획서"]}</th>'
+    html += f'<th class="bg-purple task-col">{headers_row2["논문 요약"]}</th>'
+    html += f'<th class="bg-green task-col">{headers_row2["연구사"]}</th><th class="bg-green task-col">{headers_row2["연구사"]}</th>'
+    html += f'<th class="bg-purple task-col">{headers_row2["1차 사료"]}</th>'
+    html += f'<th class="bg-green task-col">{headers_row2["사료 노트"]}</th><th class="bg-green task-col">{headers_row2["사료 노트"]}</th>'
+    html += f'<th class="bg-purple task-col">{headers_row2["초고 개요"]}</th>'
+    html += f'<th class="bg-green task-col">{headers_row2["초고 작성"]}</th><th class="bg-green task-col">{headers_row2["초고 작성"]}</th>'
+    html += f'<th class="bg-green task-col">{headers_row2["완고 발표"]}</th><th class="bg-green task-col">{headers_row2["완고 발표"]}</th>'
+    html += f'<th class="bg-green task-col">{headers_row2["완고 발표"]}</th>'
+    html += "</tr></thead>"
+    purple_cols_indices = [6, 7, 10, 11, 14, 15, 17, 20] 
+    html += "<tbody>"
+    for _, row in df.iterrows():
+        html += "<tr>"
+        seq_num = str(row.get('순번', '')) if pd.notna(row.get('순번')) else ''
+        html += f'<td class="bg-blue student-info-col">{seq_num}</td>'
+        html += f'<td class="bg-blue student-info-col">{row.get("학과", "")}</td>'
+        html += f'<td class="bg-blue student-info-col">{row.get("학번", "")}</td>'
+        html += f'<td class="bg-blue student-info-col">{row.get("성명", "")}</td>'
+        for i, col_name in enumerate(df.columns[4:], 4):
+            cell_class = "bg-purple" if i in purple_cols_indices else ""
+            html += f"<td class='task-col {cell_class}'>{row.get(col_name, '')}</td>"
+        html += "</tr>"
+    html += "</tbody></table>"
+    return html
+
+
+def _best(fn, number: int) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1000
+
+
+def main():
+    print(f"{'rows':>6} {'legacy ms':>10} {'columnar ms':>12} {'cached ms':>10} {'speedup':>8}")
+    for n in ROW_COUNTS:
+        df = make_roster(n)
+        number = max(1, 300 // n)
+        legacy = _best(lambda: legacy_generate_styled_html_table(df), number)
+        columnar = _best(lambda: render_table_body(df, None, RULES), number)
+        generate_styled_html_table(df, None, RULES)  # 캐시 채우기
+        cached = _best(lambda: generate_styled_html_table(df, None, RULES), number)
+        print(f"{n:>6} {legacy:>10.2f} {columnar:>12.2f} {cached:>10.2f} {legacy / columnar:>7.1f}x")
+
+    print(f"\n{'rows':>6} {'grade full ms':>14} {'grade incr ms':>14}")
+    for n in ROW_COUNTS:
+        df = make_roster(n)
+        changed = df.copy()
+        changed.iloc[0, 5] = "불이행"
+        changed.iloc[n - 1, 11] = "미제출"
+        full = _best(lambda: GradeEngine(RULES).totals(df), max(1, 300 // n))
+
+        def incremental():
+            engine = GradeEngine(RULES)
+            engine.totals(df)
+            t0 = time.perf_counter()
+            engine.totals(changed)
+            return time.perf_counter() - t0
+        incr = min(incremental() for _ in range(5)) * 1000
+        print(f"{n:>6} {full:>14.2f} {incr:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
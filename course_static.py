@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from html import escape
+
+# 모든 강의가 공유하는 정적 데이터. 강의별 데이터(주차별 계획, 감점 기준표 등)는 courses/<id>.toml → courses.Course.
+
+# 감점 기준표 스타일. 표 내용은 강의 파일의 [[rubric]] → grading_table_html
+GRADING_TABLE_CSS = """
+<style>
+    .grading-table {
+        /* 이 부분을 60%로 수정하고, 가운데 정렬을 추가합니다 */
+        width: 60%;
+        margin: 0 auto; 
+        border-collapse: collapse;
+        margin-top: 20px;
+        font-size: 0.95em;
+    }
+    .grading-table th, .grading-table td {
+        border: 1px solid #cccccc;
+        padding: 10px;
+        text-align: center;
+        vertical-align: middle;
+    }
+    .grading-table th {
+        background-color: #f2f2f2;
+        font-weight: bold;
+    }
+    .grading-table td.left-align {
+        text-align: left;
+    }
+</style>
+"""
+
+
+def grading_table_html(rubric) -> str:
+    """courses.RubricRow 목록 → 감점 기준표 HTML. 항목(item)이 같은 줄이 이어지면 rowspan으로 합침."""
+    rows = []
+    for i, row in enumerate(rubric):
+        cells = [escape(row.condition), escape(str(row.points))]
+        if i == 0 or rubric[i - 1].item != row.item:
+            span = next((j for j in range(i + 1, len(rubric)) if rubric[j].item != row.item), len(rubric)) - i
+            item = f'<td rowspan="{span}"><b>{escape(row.item)}</b></td>'
+        else:
+            item = ""
+        rows.append(f"<tr>{item}" + "".join(f"<td>{c}</td>" for c in cells)
+                    + f'<td class="left-align">{escape(row.criterion)}</td></tr>')
+    return (GRADING_TABLE_CSS + '<table class="grading-table"><thead><tr>'
+            "<th>항목</th><th>감점 요건</th><th>감점 점수</th><th>감점 요건 기준</th>"
+            "</tr></thead><tbody>" + "".join(rows) + "</tbody></table>")
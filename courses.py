@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import tomllib
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+
+from grading import GradingRules
+from settings import get_setting
+
+ROOT = Path(__file__).parent
+COURSES_DIR = ROOT / "courses"
+
+
+@dataclass(frozen=True)
+class RubricRow:
+    """감점 기준표([[rubric]]) 한 줄. 항목이 같은 줄이 이어지면 표에서 한 칸으로 합친다."""
+
+    item: str
+    condition: str
+    points: str
+    criterion: str = ""
+
+
+@dataclass
+class Course:
+    """courses/<id>.toml 하나. 정적 데이터(주차별 계획 표, 채점 규칙)는 불러올 때 한 번만 만든다."""
+
+    id: str
+    title: str
+    code: str = ""
+    professor: str = ""
+    email: str = ""
+    day_time: str = ""
+    classroom: str = ""
+    detail_embed_src: str = ""
+    live_embed_src: str = ""
+    qna_sheet_url: str = ""
+    schedule_sheet_url: str = ""
+    materials_dir: Path = field(default_factory=lambda: Path(get_setting("materials_dir", ROOT / "images")))
+    # 강의 소개 탭 (마크다운)
+    objectives: list[str] = field(default_factory=list)
+    method: str = ""
+    evaluation: str = ""
+    rubric: list[RubricRow] = field(default_factory=list)
+    # 발표일정 표의 과제 열과 총점 규칙. 없으면 총점 열을 붙이지 않는다
+    grading: GradingRules | None = None
+    schedule: pd.DataFrame = field(default_factory=pd.DataFrame, repr=False)
+
+    @classmethod
+    def from_file(cls, path: Path) -> Course:
+        """TOML 하나 → Course. 모르는 키나 title이 없으면 ValueError."""
+        with open(path, "rb") as f:
+            data = tomllib.load(f)
+        unknown = sorted(set(data) - ({f.name for f in fields(cls)} - {"id"}))  # ID는 파일 이름
+        if unknown:
+            raise ValueError(f"알 수 없는 키: {', '.join(unknown)}")
+        if not isinstance(data.get("title"), str):
+            raise ValueError("title(문자열)이 없습니다")
+        schedule = pd.DataFrame(data.pop("schedule", {}))
+        if "단계" in schedule.columns:
+            # 단계 셀 병합(rowspan): 단계 이름이 있는 행부터 다음 이름 전까지
+            row_spans = schedule["단계"].ne("").cumsum()
+            schedule["rowspan"] = row_spans.map(row_spans.value_counts())
+        data["rubric"] = [RubricRow(**row) for row in data.get("rubric", [])]
+        if "grading" in data:
+            data["grading"] = GradingRules.from_dict(data["grading"])
+        if "materials_dir" in data:
+            data["materials_dir"] = ROOT / data["materials_dir"]
+        return cls(id=path.stem, schedule=schedule, **data)
+
+    def schedule_url(self) -> str:
+        # 강의 파일에 없으면 단일 강의 배포에서 쓰던 설정값(schedule_sheet_url)
+        return self.schedule_sheet_url or get_setting("schedule_sheet_url", "")
+
+
+def load_courses(directory: Path = COURSES_DIR, errors: dict[str, str] | None = None) -> dict[str, Course]:
+    """directory의 *.toml을 모두 읽음. 잘못된 파일은 건너뛰고 errors[강의 ID]에 사유를 남긴다."""
+    courses = {}
+    for path in sorted(Path(directory).glob("*.toml")):
+        try:
+            courses[path.stem] = Course.from_file(path)
+        except (OSError, ValueError, TypeError) as e:  # TOMLDecodeError도 ValueError
+            if errors is not None:
+                errors[path.stem] = f"{path.name}: {e}"
+    return courses
+
+
+@st.cache_resource
+def _load_catalog() -> tuple[dict[str, Course], dict[str, str]]:
+    """프로세스당 한 번 모든 강의 정의를 읽음. 강의마다 별도 프로세스를 띄우지 않는다."""
+    errors: dict[str, str] = {}
+    return load_courses(Path(get_setting("courses_dir", COURSES_DIR)), errors), errors
+
+
+def get_courses() -> dict[str, Course]:
+    return _load_catalog()[0]
+
+
+def course_errors() -> dict[str, str]:
+    """읽지 못한 강의 정의 파일: {강의 ID: 사유}. 나머지 강의는 그대로 서비스된다."""
+    return _load_catalog()[1]
+
+
+def select_course(course_id: str | None) -> tuple[Course, bool]:
+    """(?course= 값에 해당하는 강의, 찾았는지). 없으면 default_course 설정 또는 첫 강의."""
+    courses = get_courses()
+    if not courses:
+        broken = "".join(f"\n  {e}" for e in course_errors().values())
+        raise RuntimeError(f"읽을 수 있는 강의 정의 파일(*.toml)이 없습니다: "
+                           f"{get_setting('courses_dir', COURSES_DIR)}{broken}")
+    if course_id in courses:
+        return courses[course_id], True
+    default = get_setting("default_course", "")
+    return courses.get(default) or next(iter(courses.values())), course_id is None
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import threading
+from collections import Counter
+from dataclasses import dataclass, field, fields
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import metrics
+
+# --- 감점 기준표(강의 소개 탭)를 발표일정 시트 셀 상태에 적용. 강의별 값은 courses/<id>.toml의 [grading] ---
+
+
+@dataclass(frozen=True)
+class TaskColumn:
+    """발표일정 시트의 과제 열 하나 (명단 열 다음부터 순서대로). 표 머리글과 감점 종류를 함께 정함."""
+
+    head: str
+    label: str = ""  # 두 번째 머리글 행. 비우면 head 칸이 두 행을 차지
+    kind: str = "task"  # GradingRules.deductions의 키
+    color: str = "green"  # 표 배경 (tables.TABLE_CSS의 bg-<color>)
+
+
+@dataclass
+class GradingRules:
+    """[grading] 표 하나. deductions: 열 종류별 셀 값 → 감점 (기준표의 '감점 요건' 낱말 그대로)."""
+
+    base_score: float = 0.0
+    info_columns: tuple[str, ...] = ("순번", "학과", "학번", "성명")
+    columns: tuple[TaskColumn, ...] = ()
+    deductions: dict[str, dict[str, float]] = field(default_factory=lambda: {"task": {}})
+    # 감점 없는 값 (빈 칸, 이행 표시). 이것도 deductions에도 없는 값은 오타 등으로 보고 따로 센다 (GradeEngine.stats)
+    no_deduction: frozenset[str] = frozenset({"", "O", "-"})
+
+    @classmethod
+    def from_dict(cls, data: dict) -> GradingRules:
+        """TOML의 [grading] → GradingRules. 모르는 키나 deductions에 없는 열 종류면 ValueError."""
+        unknown = sorted(set(data) - {f.name for f in fields(cls)})
+        if unknown:
+            raise ValueError(f"[grading]에 알 수 없는 키: {', '.join(unknown)}")
+        data = dict(data)
+        deductions = {kind: {k: float(v) for k, v in table.items()}
+                      for kind, table in data.pop("deductions", {}).items()}
+        deductions.setdefault("task", {})  # 목록에 없는 열은 task
+        columns = tuple(TaskColumn(**c) for c in data.pop("columns", []))
+        bad = sorted({c.kind for c in columns} - set(deductions))
+        if bad:
+            raise ValueError(f"[grading.deductions]에 없는 열 종류: {', '.join(bad)}")
+        for key in ("info_columns", "no_deduction"):
+            if key in data:
+                data[key] = (frozenset if key == "no_deduction" else tuple)(data[key])
+        return cls(columns=columns, deductions=deductions, **data)
+
+    @property
+    def task_start(self) -> int:
+        return len(self.info_columns)
+
+    def column_kinds(self, n_tasks: int) -> np.ndarray:
+        """과제 열마다 deductions 종류 번호 (columns보다 열이 많으면 나머지는 task)."""
+        kinds = list(self.deductions)
+        names = [c.kind for c in self.columns[:n_tasks]] + ["task"] * max(0, n_tasks - len(self.columns))
+        return np.array([kinds.index(k) for k in names], dtype=np.intp)
+
+
+def _cell_values(tasks: pd.DataFrame) -> np.ndarray:
+    return np.char.strip(tasks.astype(object).where(tasks.notna(), "").to_numpy(dtype=str))
+
+
+def deductions(tasks: pd.DataFrame, rules: GradingRules) -> np.ndarray:
+    """학생 × 과제 상태 행렬 → 학생별 감점 합계. 셀마다 dict 조회 대신 고유값 단위로 한 번에 변환."""
+    if tasks.shape[0] == 0 or tasks.shape[1] == 0:
+        return np.zeros(len(tasks))  # 과제 열이 아직 없으면 감점도 없음
+    values = _cell_values(tasks)
+    uniques, codes = np.unique(values, return_inverse=True)
+    # (열 종류, 고유값) → 감점 표
+    table = np.array([[points.get(u, 0.0) for u in uniques] for points in rules.deductions.values()])
+    kinds = rules.column_kinds(tasks.shape[1])
+    return table[kinds[None, :], codes.reshape(values.shape)].sum(axis=1)
+
+
+def unrecognized_cells(tasks: pd.DataFrame, rules: GradingRules) -> list[tuple[str, ...]]:
+    """행마다 기준표에 없는 셀 값 (감점 값도, no_deduction도 아님). 감점 없이 지나가는 오타를 드러내기 위함."""
+    if tasks.shape[0] == 0 or tasks.shape[1] == 0:
+        return [()] * len(tasks)
+    values = _cell_values(tasks)
+    uniques, codes = np.unique(values, return_inverse=True)
+    known = np.array([[u in rules.no_deduction or u in points for u in uniques]
+                      for points in rules.deductions.values()])
+    kinds = rules.column_kinds(tasks.shape[1])
+    unknown = ~known[kinds[None, :], codes.reshape(values.shape)]
+    return [tuple(row[mask].tolist()) for row, mask in zip(values, unknown)]
+
+
+def _row_keys(df: pd.DataFrame) -> list:
+    return df["학번"].astype(str).tolist() if "학번" in df.columns else list(range(len(df)))
+
+
+class GradeEngine:
+    """발표일정 명단의 학생별 현재 점수(rules.base_score + 감점 합).
+
+    행마다 과제 셀의 해시를 기억해 두고, 지난 동기화 이후 셀이 바뀐 행(과 새 행)만 다시 계산한다.
+    """
+
+    def __init__(self, rules: GradingRules):
+        self.rules = rules
+        self._lock = threading.Lock()
+        # 행 키(학번) → (셀 해시, 감점 합, 기준표에 없는 셀 값들)
+        self._rows: dict[object, tuple[int, float, tuple[str, ...]]] = {}
+        self._last: tuple[pd.DataFrame, pd.Series] | None = None
+
+    def totals(self, df: pd.DataFrame) -> pd.Series:
+        with self._lock:
+            if self._last is not None and self._last[0] is df:
+                return self._last[1]  # 같은 캐시 객체(시트 변경 없음)면 그대로
+
+        tasks = df.iloc[:, self.rules.task_start:]
+        if tasks.shape[1] == 0:
+            # 명단(순번/학과/학번/성명)만 있고 과제 열이 아직 없는 시트
+            totals = pd.Series(self.rules.base_score, index=df.index, name="총점")
+            with self._lock:
+                self._rows = {}
+                self._last = (df, totals)
+            return totals
+        hashes = pd.util.hash_pandas_object(tasks.astype(str), index=False).to_numpy()
+        keys = _row_keys(df)
+        with self._lock:
+            known = [self._rows.get(k) for k in keys]
+            changed = np.array([r is None or r[0] != h for r, h in zip(known, hashes)], dtype=bool)
+            result = np.array([r[1] if r is not None else 0.0 for r in known])
+            unknown = [r[2] if r is not None else () for r in known]
+            if changed.any():
+                with metrics.span("grade_recompute"):
+                    result[changed] = deductions(tasks[changed], self.rules)
+                    for i, cells in zip(np.flatnonzero(changed), unrecognized_cells(tasks[changed], self.rules)):
+                        unknown[i] = cells
+                metrics.incr("grade_rows_recomputed", int(changed.sum()))
+            self._rows = {k: (h, d, u) for k, h, d, u in zip(keys, hashes, result, unknown)}
+            totals = pd.Series(np.round(self.rules.base_score + result, 1), index=df.index, name="총점")
+            self._last = (df, totals)
+        return totals
+
+    def stats(self) -> dict:
+        """마지막으로 채점한 명단 기준: 행 수, 기준표에 없는 셀 수와 값별 개수 (많은 순 10개)."""
+        with self._lock:
+            counts = Counter(cell for _, _, cells in self._rows.values() for cell in cells)
+            return {"rows": len(self._rows), "unrecognized_cells": sum(counts.values()),
+                    "unrecognized_values": dict(counts.most_common(10))}
+
+
+@st.cache_resource
+def get_grade_engine(course_id: str) -> GradeEngine:
+    """강의마다 하나 (행 키가 학번이라 명단이 다른 강의끼리 증분 상태를 섞지 않도록). 규칙은 강의 파일의 [grading]."""
+    from courses import get_courses  # courses가 GradingRules를 쓰므로 순환 import를 피해 여기서
+
+    return GradeEngine(get_courses()[course_id].grading)
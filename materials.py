@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import hashlib
+import mimetypes
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import quote
+
+import streamlit as st
+
+import metrics
+from settings import get_setting
+
+MATERIALS_DIR = Path(__file__).parent / "images"
+DERIVED_DIR = Path(__file__).parent / ".cache" / "materials"
+
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".gif", ".webp", ".bmp"}
+# 파생 이미지: (이름, 최대 가로/세로 px, JPEG 품질)
+VARIANTS = {"thumb": (320, 80), "web": (1600, 85)}
+# 이 간격 안에서는 디렉터리를 다시 훑지 않음 (rerun마다 stat 하지 않도록)
+INDEX_CHECK_INTERVAL_S = 10
+# 다운로드용 파일 바이트를 프로세스 전체에서 이만큼까지만 메모리에 보관 (LRU)
+DOWNLOAD_CACHE_BYTES = 64 * 1024 * 1024
+# 이보다 큰 파일은 바이트를 읽지 않고 정적 파일 경로로 내려받게 함 (정적 서빙이 꺼져 있으면 '다운로드 준비' 후 읽음)
+INLINE_DOWNLOAD_MAX_BYTES = 5 * 1024 * 1024
+# Streamlit 정적 서빙(server.enableStaticServing): <앱 디렉터리>/static/ → app/static/
+STATIC_DIR = Path(__file__).parent / "static" / "materials"
+STATIC_URL = "app/static/materials"
+# 첫 색인(해시·썸네일)은 백그라운드 스레드에서 만들고, 요청 스레드는 이 시간까지만 기다림
+INDEX_INLINE_WAIT_S = 0.3
+
+
+@dataclass(frozen=True)
+class Material:
+    name: str
+    path: Path
+    size: int
+    mtime: float
+    sha256: str
+    mime: str
+    thumb: Path | None = None
+    web: Path | None = None
+
+
+def _sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _make_variant(src: Path, dest: Path, max_px: int, quality: int):
+    from PIL import Image, ImageOps  # 자료실을 처음 열 때만 불러옴
+
+    with Image.open(src) as im:
+        im = ImageOps.exif_transpose(im)
+        im.thumbnail((max_px, max_px))
+        if im.mode not in ("RGB", "L"):
+            im = im.convert("RGB")
+        tmp = dest.with_suffix(".tmp")
+        im.save(tmp, "JPEG", quality=quality, optimize=True)
+    os.replace(tmp, dest)
+
+
+class MaterialIndex:
+    """자료실 디렉터리 색인 (이름/크기/수정 시각/SHA-256) + 내용 해시로 저장한 썸네일·웹용 이미지.
+
+    파일 목록이나 (크기, 수정 시각)이 바뀐 경우에만 다시 만들고, 바뀌지 않은 파일은 해시도 재사용한다.
+    """
+
+    def __init__(self, directory: Path = MATERIALS_DIR, derived_dir: Path = DERIVED_DIR,
+                 static_dir: Path = STATIC_DIR):
+        self.directory = Path(directory)
+        self.derived_dir = Path(derived_dir)
+        self.static_dir = Path(static_dir)
+        self._lock = threading.Lock()
+        self._signature: tuple = ()
+        self._checked_at = float("-inf")
+        self._building: threading.Event | None = None  # 색인을 만드는 중이면 완료 이벤트
+        self._materials: list[Material] = []
+        self._downloads: OrderedDict[str, bytes] = OrderedDict()
+        self._download_bytes = 0
+
+    def _scan(self) -> tuple:
+        if not self.directory.is_dir():
+            return ()
+        with os.scandir(self.directory) as it:
+            files = [(e.name, e.stat().st_size, e.stat().st_mtime_ns) for e in it
+                     if e.is_file() and not e.name.startswith(".")]
+        return tuple(sorted(files))
+
+    def materials(self, wait: float = INDEX_INLINE_WAIT_S) -> list[Material]:
+        """현재 색인. 다시 만들어야 하면 백그라운드에서 시작하고 최대 wait초만 기다린 뒤 있는 값을 돌려줌."""
+        with self._lock:
+            if time.monotonic() - self._checked_at >= INDEX_CHECK_INTERVAL_S:
+                self._checked_at = time.monotonic()
+                signature = self._scan()
+                if signature != self._signature and self._building is None:
+                    self._building = threading.Event()
+                    threading.Thread(target=self._rebuild, args=(signature, self._building),
+                                     name="materials-index", daemon=True).start()
+            building = self._building
+        if building is not None:
+            building.wait(wait)
+        with self._lock:
+            return self._materials
+
+    @property
+    def building(self) -> bool:
+        with self._lock:
+            return self._building is not None
+
+    def _rebuild(self, signature: tuple, done: threading.Event):
+        try:
+            previous = {(m.name, m.size, m.mtime): m.sha256 for m in self._materials}
+            materials = []
+            with metrics.span("materials_index"):
+                for name, size, mtime_ns in signature:
+                    path = self.directory / name
+                    mtime = mtime_ns / 1e9
+                    sha = previous.get((name, size, mtime)) or _sha256(path)
+                    mime = mimetypes.guess_type(name)[0] or "application/octet-stream"
+                    variants = self._variants(path, sha) if path.suffix.lower() in IMAGE_SUFFIXES else {}
+                    materials.append(Material(name, path, size, mtime, sha, mime, **variants))
+            with self._lock:
+                self._materials = materials
+                self._signature = signature
+            metrics.incr("materials_index_rebuilds")
+        except Exception:
+            metrics.incr("materials_index_errors")  # 다음 확인 주기에 다시 시도
+        finally:
+            with self._lock:
+                self._building = None
+            done.set()
+
+    def _variants(self, path: Path, sha: str) -> dict[str, Path]:
+        """내용 해시로 이름 붙인 파생 이미지. 이미 있으면 그대로 사용 (파일명이 바뀌어도 재생성 안 함)."""
+        out = {}
+        self.derived_dir.mkdir(parents=True, exist_ok=True)
+        for variant, (max_px, quality) in VARIANTS.items():
+            dest = self.derived_dir / f"{sha[:24]}_{variant}.jpg"
+            if not dest.exists():
+                try:
+                    with metrics.span("materials_variant", variant=variant):
+                        _make_variant(path, dest, max_px, quality)
+                except Exception:
+                    metrics.incr("materials_variant_errors", variant=variant)
+                    continue
+            out[variant] = dest
+        return out
+
+    def download_bytes(self, material: Material) -> bytes:
+        """다운로드 버튼용 바이트. 내용 해시로 프로세스 전체 LRU에 보관해 rerun/세션마다 다시 읽지 않음."""
+        with self._lock:
+            data = self._downloads.get(material.sha256)
+            if data is not None:
+                self._downloads.move_to_end(material.sha256)
+                return data
+        data = material.path.read_bytes()
+        metrics.incr("materials_download_reads")
+        with self._lock:
+            if material.sha256 not in self._downloads and len(data) <= DOWNLOAD_CACHE_BYTES:
+                self._downloads[material.sha256] = data
+                self._download_bytes += len(data)
+                while self._download_bytes > DOWNLOAD_CACHE_BYTES:
+                    _, old = self._downloads.popitem(last=False)
+                    self._download_bytes -= len(old)
+        return data
+
+    def static_url(self, material: Material) -> str:
+        """큰 파일용: 정적 서빙 디렉터리에 (하드 링크로) 내보내고 그 URL을 돌려줌. 바이트는 읽지 않는다."""
+        dest = self.static_dir / material.sha256[:24] / material.name
+        if not dest.exists():
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            tmp = dest.with_name(dest.name + ".tmp")
+            try:
+                os.link(material.path, tmp)
+            except OSError:
+                shutil.copyfile(material.path, tmp)  # 다른 파일 시스템이면 한 번만 복사
+            os.replace(tmp, dest)
+            metrics.incr("materials_static_exports")
+        return f"{STATIC_URL}/{material.sha256[:24]}/{quote(material.name)}"
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"files": len(self._materials), "download_cache_bytes": self._download_bytes,
+                    "building": self._building is not None}
+
+
+def format_size(n: int) -> str:
+    for unit in ("B", "KB", "MB"):
+        if n < 1024:
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GB"
+
+
+@st.cache_resource
+def get_material_index(directory: Path = MATERIALS_DIR) -> MaterialIndex:
+    """디렉터리마다 하나. 같은 디렉터리를 쓰는 강의끼리는 색인/다운로드 캐시를 공유.
+
+    파생 이미지(썸네일 등) 위치는 설정값 materials_cache_dir, 없으면 DERIVED_DIR.
+    """
+    return MaterialIndex(Path(directory), Path(get_setting("materials_cache_dir", DERIVED_DIR)))
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import functools
+import threading
+import time
+from contextlib import contextmanager
+
+from settings import get_setting
+
+# 계측은 metrics_enabled(METRICS_ENABLED)가 켜져 있을 때만. 꺼져 있으면 데코레이터는 원래 함수를
+# 그대로 돌려주고, incr()/span()은 플래그 확인 한 번만 한다.
+ENABLED = str(get_setting("metrics_enabled", "false")).lower() in ("1", "true", "yes", "on")
+
+_lock = threading.Lock()
+# (이름, 라벨 튜플) → [횟수, 합계 초, 최대 초]
+_timings: dict[tuple, list[float]] = {}
+# (이름, 라벨 튜플) → 값
+_counters: dict[tuple, float] = {}
+
+
+def _key(name: str, labels: dict) -> tuple:
+    return (name, tuple(sorted(labels.items())))
+
+
+def observe(name: str, seconds: float, **labels):
+    if not ENABLED:
+        return
+    with _lock:
+        t = _timings.setdefault(_key(name, labels), [0, 0.0, 0.0])
+        t[0] += 1
+        t[1] += seconds
+        t[2] = max(t[2], seconds)
+
+
+def incr(name: str, value: float = 1, **labels):
+    if not ENABLED:
+        return
+    with _lock:
+        k = _key(name, labels)
+        _counters[k] = _counters.get(k, 0) + value
+
+
+@contextmanager
+def span(name: str, **labels):
+    if not ENABLED:
+        yield
+        return
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - t0, **labels)
+
+
+def instrument(name: str | None = None, **labels):
+    """함수 실행 시간을 기록하는 데코레이터. 계측이 꺼져 있으면 함수를 감싸지 않는다."""
+    def deco(fn):
+        if not ENABLED:
+            return fn
+        metric = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                observe(metric, time.perf_counter() - t0, **labels)
+        return wrapper
+    return deco
+
+
+def snapshot() -> tuple[list[dict], list[dict]]:
+    """(타이밍 목록, 카운터 목록) — 관리자 화면 표시용."""
+    with _lock:
+        timings = [
+            {"name": n, **dict(lbl), "count": int(c), "total_ms": round(s * 1000, 2),
+             "avg_ms": round(s / c * 1000, 2) if c else 0.0, "max_ms": round(m * 1000, 2)}
+            for (n, lbl), (c, s, m) in sorted(_timings.items())
+        ]
+        counters = [{"name": n, **dict(lbl), "value": v} for (n, lbl), v in sorted(_counters.items())]
+    return timings, counters
+
+
+def reset():
+    with _lock:
+        _timings.clear()
+        _counters.clear()
+
+
+def _escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape_label(v)}"' for k, v in labels) + "}"
+
+
+def prometheus_text(extra_gauges: dict[str, dict] | None = None) -> str:
+    """Prometheus text exposition 형식으로 내보내기.
+
+    extra_gauges: {이름: {라벨 튜플: 값}} — 캐시/클라이언트 풀 통계처럼 다른 모듈이 이미 세고 있는 값.
+    """
+    lines = []
+    with _lock:
+        timings = sorted(_timings.items())
+        counters = sorted(_counters.items())
+
+    lines.append("# TYPE app_duration_seconds summary")
+    for (n, lbl), (c, s, _) in timings:
+        labels = _labels((("name", n),) + lbl)
+        lines.append(f"app_duration_seconds_count{labels} {int(c)}")
+        lines.append(f"app_duration_seconds_sum{labels} {s:.6f}")
+    lines.append("# TYPE app_duration_seconds_max gauge")
+    for (n, lbl), (_, _, m) in timings:
+        lines.append(f"app_duration_seconds_max{_labels((('name', n),) + lbl)} {m:.6f}")
+
+    names = sorted({n for (n, _), _ in counters})
+    for n in names:
+        lines.append(f"# TYPE app_{n}_total counter")
+        for (cn, lbl), v in counters:
+            if cn == n:
+                lines.append(f"app_{n}_total{_labels(lbl)} {v:g}")
+
+    for gauge, values in (extra_gauges or {}).items():
+        lines.append(f"# TYPE app_{gauge} gauge")
+        for lbl, v in sorted(values.items()):
+            lines.append(f"app_{gauge}{_labels(lbl)} {v:g}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import atexit
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+
+import streamlit as st
+
+from qna_sync import QNA_HEADER, QNA_WORKSHEET, write_through
+from resilience import guarded
+from settings import get_setting
+from sheet_cache import get_sheet_cache
+from storage import get_storage_backend, get_storage_breakers
+
+SPOOL_PATH = Path(__file__).parent / ".cache" / "qna_spool.sqlite3"
+
+# N ms마다 또는 M행이 쌓이면 한 번에 append_rows
+FLUSH_INTERVAL_MS = 2000
+MAX_BATCH_ROWS = 50
+# 시트 쓰기 실패 시 재시도 간격(최대). 시트마다 따로 늘어남
+MAX_RETRY_DELAY_S = 60
+
+
+class QnaWriteQueue:
+    """질문 제출을 로컬 SQLite 스풀에 먼저 기록하고, 백그라운드 스레드가 묶어서 시트에 반영."""
+
+    def __init__(self, backend, spool_path: Path = SPOOL_PATH,
+                 flush_interval_ms: int = FLUSH_INTERVAL_MS, max_batch: int = MAX_BATCH_ROWS,
+                 on_flush=None, breakers=None):
+        self.backend = backend
+        self.breakers = breakers  # 시트 호출은 시트별 회로 차단기 + 429 백오프를 거침
+        self.on_flush = on_flush  # on_flush(sheet_url, values): 시트 반영 직후 호출
+        self.spool_path = Path(spool_path)
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_batch = max_batch
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._header_ok: set[str] = set()  # 헤더 확인이 끝난 시트 URL
+        # 실패한 시트만 (재시도 간격, 다음 시도 시각) — 한 시트가 막혀도 다른 시트는 그대로 반영
+        self._retry: dict[str, tuple[float, float]] = {}
+        self.last_errors: dict[str, str] = {}
+
+        self.spool_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._db() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS pending ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " sheet_url TEXT NOT NULL, ts TEXT NOT NULL, name TEXT NOT NULL, question TEXT NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS pending_sheet ON pending (sheet_url, id)")
+
+        # 이전 프로세스가 남긴 스풀도 이 스레드가 이어서 처리
+        self._thread = threading.Thread(target=self._run, name="qna-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def _db(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.spool_path, timeout=10)
+
+    # --- 스크립트 스레드에서 호출 ---
+    def submit(self, sheet_url: str, name: str, question: str) -> int:
+        ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self._db() as db:
+            cur = db.execute(
+                "INSERT INTO pending (sheet_url, ts, name, question) VALUES (?, ?, ?, ?)",
+                (sheet_url, ts, name, question),
+            )
+            row_id = cur.lastrowid
+            count = db.execute("SELECT COUNT(*) FROM pending WHERE sheet_url = ?", (sheet_url,)).fetchone()[0]
+        if count >= self.max_batch:
+            self._wakeup.set()
+        return row_id
+
+    def pending_rows(self, sheet_url: str) -> list[list[str]]:
+        with self._db() as db:
+            rows = db.execute(
+                "SELECT ts, name, question FROM pending WHERE sheet_url = ? ORDER BY id", (sheet_url,)
+            ).fetchall()
+        return [[ts, name, question, ""] for ts, name, question in rows]
+
+    # --- 백그라운드 ---
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def _ensure_header(self, sheet_url: str):
+        if sheet_url in self._header_ok:
+            return
+
+        def _check(ws):
+            # 완전 빈 시트일 때만 헤더 생성
+            header = ws.row_values(1)
+            if header != QNA_HEADER and not any(header):
+                ws.append_row(QNA_HEADER)
+
+        self.backend.run(sheet_url, QNA_WORKSHEET, _check)
+        self._header_ok.add(sheet_url)
+
+    def flush(self) -> int:
+        """스풀에 쌓인 질문을 시트별로 최대 max_batch행씩 append_rows 한 번으로 반영. 반영한 행 수를 반환.
+
+        재시도 대기 중인 시트는 건너뛴다.
+        """
+        written = 0
+        more = False
+        with self._lock:
+            with self._db() as db:
+                sheet_urls = [r[0] for r in db.execute("SELECT DISTINCT sheet_url FROM pending")]
+            now = time.monotonic()
+            for sheet_url in sheet_urls:
+                if self._retry.get(sheet_url, (0.0, 0.0))[1] > now:
+                    continue
+                with self._db() as db:
+                    batch = db.execute(
+                        "SELECT id, ts, name, question FROM pending WHERE sheet_url = ? ORDER BY id LIMIT ?",
+                        (sheet_url, self.max_batch),
+                    ).fetchall()
+                values = [[ts, name, question, ""] for _, ts, name, question in batch]
+                try:
+                    guarded(self.breakers, sheet_url, lambda: self._ensure_header(sheet_url))
+                    guarded(self.breakers, sheet_url, lambda: self.backend.run(
+                        sheet_url, QNA_WORKSHEET,
+                        lambda ws: ws.append_rows(values, value_input_option="RAW"),
+                    ))
+                except Exception as e:
+                    self.last_errors[sheet_url] = str(e)
+                    delay = min(max(self._retry.get(sheet_url, (0.0, 0.0))[0] * 2, 1.0), MAX_RETRY_DELAY_S)
+                    self._retry[sheet_url] = (delay, time.monotonic() + delay)
+                    continue
+                with self._db() as db:
+                    db.executemany("DELETE FROM pending WHERE id = ?", [(b[0],) for b in batch])
+                written += len(batch)
+                more = more or len(batch) >= self.max_batch
+                self.last_errors.pop(sheet_url, None)
+                self._retry.pop(sheet_url, None)
+                if self.on_flush is not None:
+                    try:
+                        self.on_flush(sheet_url, values)
+                    except Exception:
+                        pass  # 캐시 병합 실패는 다음 재검증에서 바로잡힘
+
+        # 한 번에 다 못 보낸 시트가 있으면 바로 다음 배치
+        if more:
+            self._wakeup.set()
+        return written
+
+
+@st.cache_resource
+def get_write_queue() -> QnaWriteQueue:
+    spool_path = Path(get_setting("qna_spool_path", SPOOL_PATH))
+    # 쓰기 스레드에서 cache_resource를 부르지 않도록 공용 캐시는 여기서 받아 둠
+    return QnaWriteQueue(get_storage_backend(), spool_path=spool_path,
+                         on_flush=partial(write_through, get_sheet_cache()), breakers=get_storage_breakers())
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+
+import pandas as pd
+import streamlit as st
+
+import metrics
+from resilience import guarded, is_backend_failure
+from storage import get_storage_backend, get_storage_breakers
+
+QNA_WORKSHEET = "Questions"
+QNA_HEADER = ["Timestamp", "Name", "Question", "Answer"]
+
+# 이 횟수마다 한 번은 전체를 다시 받아 삭제/수정된 행을 바로잡음
+FULL_RESYNC_EVERY = 40
+
+
+def _col_letter(col: int) -> str:
+    from gspread.utils import rowcol_to_a1
+
+    return rowcol_to_a1(1, col)[:-1]
+
+
+def _pad(rows: list[list[str]], width: int) -> list[list[str]]:
+    # Sheets API는 뒤쪽 빈 셀을 생략하므로 폭을 맞춰 줌
+    return [(r + [""] * width)[:width] for r in rows]
+
+
+class QnaDeltaSync:
+    """'Questions' 시트를 증분 동기화: 새 행만 범위 조회 + Answer 열만 재조회.
+
+    검색 인덱스가 붙은 DataFrame(build_qna_index)도 함께 들고 있으면서, 증분 동기화 뒤에는 새 행만 인덱싱해
+    덧붙이고 바뀐 Answer 행만 고친다. 전체 조회 때만 처음부터 다시 만든다.
+    """
+
+    def __init__(self, backend, sheet_url: str, worksheet: str = QNA_WORKSHEET, breakers=None):
+        self.backend = backend
+        self.breakers = breakers
+        self.sheet_url = sheet_url
+        self.worksheet = worksheet
+        self._lock = threading.Lock()
+        self._header: list[str] = []
+        self._rows: list[list[str]] = []
+        self._frame: pd.DataFrame | None = None
+        self._syncs = 0
+
+    @property
+    def row_count(self) -> int:
+        return len(self._rows)
+
+    def _full_sync(self, ws):
+        values = ws.get_all_values()
+        self._header = values[0] if values else []
+        self._rows = _pad(values[1:], len(self._header))
+
+    def _delta_sync(self, ws) -> tuple[int, list[int]] | None:
+        """(기존 행 수, Answer가 바뀐 기존 행 번호). 위치가 밀려 전체 조회로 바꿨으면 None."""
+        width = len(self._header)
+        answer_col = self._header.index("Answer") + 1
+        ts_col = self._header.index("Timestamp") + 1
+        n = len(self._rows)
+        # 마지막으로 본 행의 Timestamp 셀 + 새 행(그 다음부터 끝까지) + Answer 열을 요청 한 번으로
+        anchor_range = f"{_col_letter(ts_col)}{n + 1}"
+        new_range = f"A{n + 2}:{_col_letter(width)}"
+        answer_range = f"{_col_letter(answer_col)}2:{_col_letter(answer_col)}"
+        anchor, new_rows, answers = ws.batch_get([anchor_range, new_range, answer_range])
+
+        anchor = anchor[0][0] if anchor and anchor[0] else ""
+        new_rows = _pad([list(r) for r in new_rows], width)
+        answers = [r[0] if r else "" for r in answers]
+        if anchor != self._rows[-1][ts_col - 1] or len(answers) > n + len(new_rows):
+            # 행이 삭제/삽입되어 위치가 밀렸으면 전체 재동기화
+            metrics.incr("qna_sync_events", event="shifted")
+            self._full_sync(ws)
+            return None
+        answers += [""] * (n + len(new_rows) - len(answers))
+        changed = [i for i in range(n) if self._rows[i][answer_col - 1] != answers[i]]
+        for i in changed:
+            self._rows[i][answer_col - 1] = answers[i]
+        for row, answer in zip(new_rows, answers[n:]):
+            row[answer_col - 1] = answer
+        self._rows.extend(new_rows)
+        return n, changed
+
+    def _merge(self, delta: tuple[int, list[int]] | None) -> pd.DataFrame:
+        """동기화 결과를 인덱스가 붙은 DataFrame에 반영. 바뀐 것이 없으면 같은 객체를 그대로 돌려줌."""
+        if not self._rows or not all(c in self._header for c in QNA_HEADER):
+            self._frame = build_qna_index(pd.DataFrame(columns=QNA_HEADER))
+            return self._frame
+        if delta is None or self._frame is None:
+            self._frame = build_qna_index(pd.DataFrame([list(r) for r in self._rows], columns=self._header))
+            return self._frame
+
+        n, changed = delta
+        frame = self._frame
+        if changed:
+            # 세션들이 읽고 있는 객체는 고치지 않고 복사본에서 바뀐 행만 다시 인덱싱
+            frame = frame.copy()
+            patched = build_qna_index(pd.DataFrame([self._rows[i] for i in changed], columns=self._header,
+                                                   index=changed))
+            frame.loc[changed, patched.columns] = patched
+            metrics.incr("qna_sync_rows_patched", len(changed))
+        if len(self._rows) > n:
+            added = build_qna_index(pd.DataFrame([list(r) for r in self._rows[n:]], columns=self._header,
+                                                 index=range(n, len(self._rows))))
+            frame = pd.concat([frame, added])
+            metrics.incr("qna_sync_rows_appended", len(self._rows) - n)
+        self._frame = frame
+        return frame
+
+    @metrics.instrument("qna_sync_refresh")
+    def refresh(self) -> pd.DataFrame:
+        """인덱스(build_qna_index)가 붙은 Q&A DataFrame."""
+        with self._lock:
+            def _sync(ws):
+                if (not self._rows or not all(c in self._header for c in QNA_HEADER)
+                        or self._syncs % FULL_RESYNC_EVERY == 0):
+                    self._full_sync(ws)
+                    return None
+                try:
+                    return self._delta_sync(ws)
+                except Exception as e:
+                    if is_backend_failure(e):
+                        raise  # 429/전송 오류는 백오프·회로 차단기로
+                    # 증분 조회가 실패하면 전체 조회로 (그것도 실패하면 호출자에게 올라감)
+                    metrics.incr("qna_sync_events", event="delta_error")
+                    self._full_sync(ws)
+                    return None
+
+            delta = guarded(self.breakers, self.sheet_url,
+                            lambda: self.backend.run(self.sheet_url, self.worksheet, _sync))
+            self._syncs += 1
+            return self._merge(delta)
+
+
+@metrics.instrument()
+def build_qna_index(df):
+    """검색용 소문자 인덱스 열을 한 번만 만들어 둠 (키 입력마다 원문을 다시 훑지 않도록)."""
+    df = df.copy()
+    df["_name"] = df["Name"].astype(str).str.lower()
+    df["_text"] = (df["Question"].astype(str) + "\n" + df["Answer"].astype(str)).str.lower()
+    df["_answered"] = df["Answer"].astype(str).str.strip() != ""
+    return df
+
+
+def filter_qna(df, name="", text="", unanswered_only=False):
+    mask = pd.Series(True, index=df.index)
+    if name:
+        mask &= df["_name"].str.contains(name.lower(), regex=False)
+    if text:
+        mask &= df["_text"].str.contains(text.lower(), regex=False)
+    if unanswered_only:
+        mask &= ~df["_answered"]
+    return df[mask]
+
+
+def qna_version(df) -> tuple:
+    """(행 수, Answer 열 해시) — 목록을 다시 그려야 하는지 판단하는 가벼운 버전 토큰."""
+    answers = "\x1f".join(df["Answer"].astype(str)) if "Answer" in df.columns else ""
+    return (len(df), hashlib.sha1(answers.encode()).hexdigest())
+
+
+def qna_cache_key(sheet_url: str) -> tuple:
+    return ("qna", sheet_url)
+
+
+def write_through(cache, sheet_url: str, values: list[list[str]]):
+    """시트에 막 반영된 행을 캐시된 Q&A DataFrame에 바로 병합하고, Q&A 항목만 재검증 대상으로 표시.
+
+    다른 시트(발표일정 등)의 캐시는 건드리지 않는다. 쓰기 스레드에서 불리므로 cache는 미리 받아 넘긴다.
+    """
+    new_rows = build_qna_index(pd.DataFrame(values, columns=QNA_HEADER))
+    cache.update(qna_cache_key(sheet_url), lambda df: pd.concat([df, new_rows], ignore_index=True))
+    cache.invalidate(qna_cache_key(sheet_url))
+
+
+@st.cache_resource
+def get_qna_sync(sheet_url: str) -> QnaDeltaSync:
+    return QnaDeltaSync(get_storage_backend(), sheet_url, breakers=get_storage_breakers())
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+
+import streamlit as st
+
+import metrics
+
+# 연속 실패가 이 횟수에 이르면 회로를 열고, 열린 뒤 이 시간이 지나면 한 번 시험 호출
+FAILURE_THRESHOLD = 3
+RESET_TIMEOUT_S = 30
+# 429(쿼터 초과) 재시도: 지수 백오프 + full jitter
+BACKOFF_RETRIES = 4
+BACKOFF_BASE_S = 0.5
+BACKOFF_MAX_S = 8.0
+
+
+class SheetReadError(RuntimeError):
+    """시트 읽기 경로가 모두 실패했을 때. 값으로 캐시하지 않고 호출자에게 올려 보낸다."""
+
+
+class CircuitOpenError(SheetReadError):
+    """회로가 열려 있어 백엔드 호출을 건너뜀."""
+
+
+def is_quota_error(e: Exception) -> bool:
+    import gspread
+
+    if isinstance(e, gspread.exceptions.APIError):
+        return getattr(e, "code", None) == 429
+    text = str(e)
+    return "429" in text or "RESOURCE_EXHAUSTED" in text
+
+
+def is_backend_failure(e: Exception) -> bool:
+    """회로 차단기가 실패로 셀 오류인지: 전송 오류, 5xx, 429, 인증 만료(401).
+
+    WorksheetNotFound, 잘못된 범위(400), 권한 없음(403) 같은 요청 오류는 백엔드가 응답한 것이므로 세지 않는다.
+    """
+    if isinstance(e, (ConnectionError, TimeoutError)) or is_quota_error(e):
+        return True
+    import gspread
+    import requests
+    from google.auth import exceptions as auth_exceptions
+
+    if isinstance(e, gspread.exceptions.APIError):
+        code = getattr(e, "code", None) or 0
+        return code in (401, 429) or code >= 500
+    if isinstance(e, requests.exceptions.HTTPError) and e.response is not None:
+        code = e.response.status_code
+        return code in (401, 429) or code >= 500
+    return isinstance(e, (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                          auth_exceptions.RefreshError, auth_exceptions.TransportError))
+
+
+class CircuitBreaker:
+    """백엔드별 회로 차단기: closed → (연속 실패) → open → (대기 후) half_open → 성공 시 closed."""
+
+    def __init__(self, name: str, failure_threshold: int = FAILURE_THRESHOLD,
+                 reset_timeout: float = RESET_TIMEOUT_S, is_failure=is_backend_failure):
+        self.name = name
+        self.is_failure = is_failure  # 이 차단기가 실패로 셀 오류
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self.state = "closed"
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = "half_open"
+            if self.state == "half_open" and not self._probing:
+                self._probing = True  # 시험 호출은 한 번에 하나만
+                return True
+            metrics.incr("circuit_breaker_skips", backend=self.name)
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    metrics.incr("circuit_breaker_opened", backend=self.name)
+                self.state = "open"
+                self._opened_at = time.monotonic()
+
+    def release_probe(self):
+        """실패로 세지 않는 오류로 끝난 호출: 상태는 그대로 두고 시험 호출 자리만 돌려놓음."""
+        with self._lock:
+            self._probing = False
+
+    def call(self, fn):
+        if not self.allow():
+            raise CircuitOpenError(f"{self.name}: 연속 실패로 잠시 건너뜀")
+        try:
+            result = fn()
+        except Exception as e:
+            # 안쪽 차단기가 건너뛴 것(CircuitOpenError)은 이 차단기의 실패가 아님
+            if not isinstance(e, CircuitOpenError) and self.is_failure(e):
+                self.record_failure()
+            else:
+                self.release_probe()
+            raise
+        self.record_success()
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"state": self.state, "failures": self.failures}
+
+
+def with_backoff(fn, retries: int = BACKOFF_RETRIES, base: float = BACKOFF_BASE_S, cap: float = BACKOFF_MAX_S):
+    """fn()을 실행하고 429면 지수 백오프(full jitter) 후 재시도. 다른 오류는 그대로 올림."""
+    for attempt in range(retries + 1):
+        try:
+            return fn()
+        except Exception as e:
+            if attempt == retries or not is_quota_error(e):
+                raise
+            metrics.incr("sheets_quota_retries")
+            time.sleep(random.uniform(0, min(cap, base * 2 ** attempt)))
+
+
+def _is_sheet_failure(e: Exception) -> bool:
+    return is_backend_failure(e) and not is_quota_error(e)
+
+
+class BreakerGroup:
+    """저장소 백엔드 하나의 회로 차단기 묶음.
+
+    쿼터(429)는 프로젝트 단위라 백엔드 전체에서 하나로 세고, 전송 오류/5xx/인증 만료는 스프레드시트마다 따로
+    센다. 시트 하나가 고장 나도 다른 강의·시트의 읽기와 질문 쓰기는 계속된다.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.quota = CircuitBreaker(f"{name}:quota", is_failure=is_quota_error)
+        self._lock = threading.Lock()
+        self._sheets: dict[str, CircuitBreaker] = {}
+
+    def for_sheet(self, sheet_url: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._sheets.get(sheet_url)
+            if breaker is None:
+                breaker = self._sheets[sheet_url] = CircuitBreaker(f"{self.name}:{sheet_url}",
+                                                                   is_failure=_is_sheet_failure)
+            return breaker
+
+    def call(self, sheet_url: str, fn):
+        sheet = self.for_sheet(sheet_url)
+        return self.quota.call(lambda: sheet.call(fn))
+
+    def stats(self) -> dict[str, dict]:
+        """{차단기 이름: stats()} — 쿼터 차단기 + 시트별 차단기."""
+        with self._lock:
+            breakers = [self.quota, *self._sheets.values()]
+        return {b.name: b.stats() for b in breakers}
+
+
+def guarded(breakers: BreakerGroup | None, sheet_url: str, fn):
+    """시트의 회로 차단기(있으면) 안에서 429 백오프와 함께 fn() 실행."""
+    if breakers is None:
+        return with_backoff(fn)
+    return breakers.call(sheet_url, lambda: with_backoff(fn))
+
+
+@st.cache_resource
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    return CircuitBreaker(name)
+
+
+@st.cache_resource
+def get_breaker_group(name: str) -> BreakerGroup:
+    return BreakerGroup(name)
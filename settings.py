@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+import os
+
+import streamlit as st
+
+
+def get_setting(key: str, default=None):
+    """환경변수(대문자 키) → st.secrets 순으로 설정값 조회. secrets.toml이 없어도 기본값 반환."""
+    env = os.environ.get(key.upper())
+    if env is not None:
+        return env
+    try:
+        return st.secrets.get(key, default)
+    except Exception:
+        return default
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import streamlit as st
+
+import metrics
+from settings import get_setting
+from snapshots import SNAPSHOT_DIR, SnapshotStore
+
+# 이 시간이 지나면 다음 조회 때 백그라운드에서 재검증 (그동안은 이전 값 제공)
+DEFAULT_TTL = 15
+# 첫 조회를 기다리는 다른 세션의 최대 대기 시간
+FETCH_WAIT_TIMEOUT = 60
+
+
+@dataclass
+class _Entry:
+    value: object = None
+    has_value: bool = False
+    fetched_at: float = 0.0
+    signal: object = None
+    inflight: threading.Event | None = None
+    error: str | None = None
+    as_of: float | None = None  # 값이 마지막으로 확인된 시각 (epoch 초)
+    from_snapshot: bool = False
+
+
+class SheetCache:
+    """모든 시트 읽기용 공용 캐시.
+
+    - stale-while-revalidate: 만료된 값은 바로 돌려주고 백그라운드에서 갱신
+    - 조건부 재검증: signal()(예: Drive modifiedTime)이 그대로면 값을 다시 받지 않음
+    - 요청 병합: 키마다 동시에 최대 한 번만 fetch
+    - 스냅샷: 받아온 DataFrame을 디스크에 남기고, 재시작 직후에는 스냅샷부터 제공
+    """
+
+    def __init__(self, ttl: float = DEFAULT_TTL, snapshots: SnapshotStore | None = None):
+        self.ttl = ttl
+        self.snapshots = snapshots
+        self._lock = threading.Lock()
+        self._entries: dict[tuple, _Entry] = {}
+        self._stats = {"hits": 0, "stale_hits": 0, "misses": 0, "fetches": 0, "unchanged": 0, "errors": 0}
+
+    def get(self, key: tuple, fetch, signal=None, ttl: float | None = None):
+        ttl = self.ttl if ttl is None else ttl
+        leader = False
+        with self._lock:
+            entry = self._entries.setdefault(key, _Entry())
+            if not entry.has_value and entry.inflight is None and self.snapshots is not None:
+                self._restore_snapshot(key, entry)
+            if entry.has_value:
+                if time.monotonic() - entry.fetched_at < ttl:
+                    self._stats["hits"] += 1
+                    metrics.incr("sheet_cache_events", cache=key[0], event="hit")
+                elif entry.inflight is None:
+                    self._stats["stale_hits"] += 1
+                    metrics.incr("sheet_cache_events", cache=key[0], event="stale_hit")
+                    entry.inflight = threading.Event()
+                    threading.Thread(
+                        target=self._refresh, args=(key, entry, fetch, signal),
+                        name=f"sheet-cache-{key[0]}", daemon=True,
+                    ).start()
+                else:
+                    self._stats["stale_hits"] += 1
+                    metrics.incr("sheet_cache_events", cache=key[0], event="stale_hit")
+                return entry.value
+
+            self._stats["misses"] += 1
+            metrics.incr("sheet_cache_events", cache=key[0], event="miss")
+            waiter = entry.inflight
+            if waiter is None:
+                entry.inflight = threading.Event()
+                leader = True
+
+        if leader:
+            self._refresh(key, entry, fetch, signal, raise_errors=True)
+            return entry.value
+
+        # 다른 세션이 이미 받아오는 중이면 그 결과를 기다림
+        waiter.wait(FETCH_WAIT_TIMEOUT)
+        with self._lock:
+            if entry.has_value:
+                return entry.value
+            raise RuntimeError(entry.error or "시트 데이터를 불러오지 못했습니다.")
+
+    def _restore_snapshot(self, key: tuple, entry: _Entry):
+        # 프로세스 첫 조회: 스냅샷을 바로 쓰고 만료 처리해 두어 곧바로 백그라운드 갱신이 돌게 함
+        snap = self.snapshots.load(key)
+        if snap is None:
+            return
+        entry.value, entry.as_of, entry.signal = snap
+        entry.has_value = True
+        entry.from_snapshot = True
+        entry.fetched_at = float("-inf")
+        metrics.incr("sheet_cache_events", cache=key[0], event="snapshot_restore")
+
+    def _refresh(self, key: tuple, entry: _Entry, fetch, signal, raise_errors: bool = False):
+        try:
+            sig = None
+            if signal is not None:
+                try:
+                    with metrics.span("sheet_change_signal", cache=key[0]):
+                        sig = signal()
+                except Exception:
+                    sig = None  # 변경 신호를 못 얻으면 그냥 새로 받음
+            if entry.has_value and sig is not None and sig == entry.signal:
+                with self._lock:
+                    entry.fetched_at = time.monotonic()
+                    entry.as_of = time.time()
+                    entry.error = None
+                    entry.from_snapshot = False  # 스냅샷이 최신임을 확인
+                    self._stats["unchanged"] += 1
+                metrics.incr("sheet_cache_events", cache=key[0], event="unchanged")
+                return
+
+            with metrics.span("sheet_fetch", cache=key[0]):
+                value = fetch()
+            with self._lock:
+                entry.value = value
+                entry.has_value = True
+                entry.fetched_at = time.monotonic()
+                entry.signal = sig
+                entry.error = None
+                entry.as_of = time.time()
+                entry.from_snapshot = False
+                self._stats["fetches"] += 1
+            metrics.incr("sheet_cache_events", cache=key[0], event="fetch")
+            if self.snapshots is not None:
+                try:
+                    self.snapshots.save(key, value, entry.as_of, sig)
+                except Exception:
+                    metrics.incr("sheet_cache_events", cache=key[0], event="snapshot_error")
+        except Exception as e:
+            metrics.incr("sheet_cache_events", cache=key[0], event="error")
+            with self._lock:
+                entry.error = str(e)
+                self._stats["errors"] += 1
+                if entry.has_value:
+                    entry.fetched_at = time.monotonic()  # 다음 TTL까지 이전 값 유지
+            if raise_errors:
+                raise
+        finally:
+            with self._lock:
+                done, entry.inflight = entry.inflight, None
+            if done is not None:
+                done.set()
+
+    def invalidate(self, key: tuple):
+        """해당 키만 만료 처리. 값은 남겨 두고 다음 조회 때 백그라운드 재검증."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.fetched_at = float("-inf")
+                entry.signal = None
+
+    def update(self, key: tuple, fn) -> bool:
+        """캐시된 값을 fn(value)로 교체 (write-through). 값이 없으면 아무것도 하지 않음."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or not entry.has_value:
+                return False
+            entry.value = fn(entry.value)
+            return True
+
+    def status(self, key: tuple) -> dict | None:
+        """화면 표시용: as_of(마지막 확인 시각), error(마지막 갱신 실패 사유), from_snapshot."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or not entry.has_value:
+                return None
+            return {"as_of": entry.as_of, "error": entry.error, "from_snapshot": entry.from_snapshot}
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats)
+
+
+@st.cache_resource
+def get_sheet_cache() -> SheetCache:
+    return SheetCache(snapshots=SnapshotStore(Path(get_setting("snapshot_dir", SNAPSHOT_DIR))))
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from typing import TYPE_CHECKING
+
+import streamlit as st
+
+import metrics
+
+# gspread / google-auth는 import만 100ms 이상 걸려 콜드 스타트를 늦춘다.
+# 첫 시트 호출 때 함수 안에서 불러온다 (타입 힌트용은 TYPE_CHECKING에서만).
+if TYPE_CHECKING:
+    import gspread
+    from google.oauth2.service_account import Credentials
+
+SA_PATH = Path(__file__).parent / ".streamlit" / "clever-circlet-237312-ba0859893ad2.json"
+SCOPES = [
+    "https://www.googleapis.com/auth/spreadsheets",
+    "https://www.googleapis.com/auth/drive",
+]
+
+# 만료 이 시간 전이면 미리 토큰 갱신
+TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
+# 재연결 대상 HTTP 상태 (인증 만료). 403(권한 없음)은 그 시트 하나의 문제라 재연결하지 않음
+AUTH_ERROR_CODES = (401,)
+PERMISSION_ERROR_CODES = (403,)
+
+
+def _load_credentials(source: str) -> Credentials:
+    """source: "file"이면 SA_PATH의 JSON, "secrets"이면 st.secrets["gcp_service_account"]."""
+    from google.oauth2.service_account import Credentials
+
+    if source == "file":
+        return Credentials.from_service_account_file(str(SA_PATH), scopes=SCOPES)
+    if source == "secrets":
+        return Credentials.from_service_account_info(st.secrets["gcp_service_account"], scopes=SCOPES)
+    raise ValueError(f"알 수 없는 인증 소스: {source}")
+
+
+def _is_auth_error(e: Exception) -> bool:
+    import gspread
+    from google.auth.exceptions import RefreshError
+
+    if isinstance(e, RefreshError):
+        return True
+    if isinstance(e, gspread.exceptions.APIError):
+        return getattr(e, "code", None) in AUTH_ERROR_CODES
+    return False
+
+
+def _is_permission_error(e: Exception) -> bool:
+    import gspread
+
+    return isinstance(e, gspread.exceptions.APIError) and getattr(e, "code", None) in PERMISSION_ERROR_CODES
+
+
+def _count_response_bytes(response, *args, **kwargs):
+    metrics.incr("sheets_bytes_fetched", len(response.content or b""), backend="gsheets")
+    metrics.incr("sheets_api_calls", backend="gsheets", status=response.status_code)
+
+
+class SheetsClientPool:
+    """프로세스 전체에서 공유하는 gspread 클라이언트 + 스프레드시트/워크시트 핸들 캐시."""
+
+    def __init__(self, source: str):
+        self.source = source
+        self._lock = threading.RLock()
+        self._creds: Credentials | None = None
+        self._client: gspread.Client | None = None
+        self._spreadsheets: dict[str, gspread.Spreadsheet] = {}
+        self._worksheets: dict[tuple[str, str], gspread.Worksheet] = {}
+        self._stats = {"hits": 0, "misses": 0, "authorizations": 0, "token_refreshes": 0, "reconnects": 0}
+
+    # --- 인증 ---
+    def _token_expiring(self) -> bool:
+        expiry = self._creds.expiry if self._creds else None
+        if not self._creds or not self._creds.token or expiry is None:
+            return True
+        # google-auth는 naive UTC datetime을 사용
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        return expiry - now < TOKEN_REFRESH_MARGIN
+
+    def client(self) -> gspread.Client:
+        import gspread
+        from google.auth.transport.requests import Request
+
+        with self._lock:
+            if self._client is None:
+                with metrics.span("sheets_auth", source=self.source):
+                    self._creds = _load_credentials(self.source)
+                    self._client = gspread.authorize(self._creds)
+                if metrics.ENABLED:
+                    # 응답 본문 크기 = 시트에서 받아온 바이트 수
+                    self._client.http_client.session.hooks["response"].append(_count_response_bytes)
+                self._stats["authorizations"] += 1
+            if self._token_expiring():
+                with metrics.span("sheets_token_refresh", source=self.source):
+                    self._creds.refresh(Request())
+                self._stats["token_refreshes"] += 1
+            return self._client
+
+    # --- 핸들 캐시 ---
+    def spreadsheet(self, sheet_url: str) -> gspread.Spreadsheet:
+        with self._lock:
+            gc = self.client()
+            sh = self._spreadsheets.get(sheet_url)
+            if sh is None:
+                sh = gc.open_by_url(sheet_url)
+                self._spreadsheets[sheet_url] = sh
+            return sh
+
+    def worksheet(self, sheet_url: str, worksheet: str) -> gspread.Worksheet:
+        key = (sheet_url, worksheet)
+        with self._lock:
+            self.client()  # 토큰 만료 확인
+            ws = self._worksheets.get(key)
+            if ws is not None:
+                self._stats["hits"] += 1
+                return ws
+            self._stats["misses"] += 1
+            ws = self.spreadsheet(sheet_url).worksheet(worksheet)
+            self._worksheets[key] = ws
+            return ws
+
+    def last_update_time(self, sheet_url: str) -> str:
+        """Drive 메타데이터의 modifiedTime (값을 받지 않고 변경 여부만 확인하는 용도)."""
+        return self.spreadsheet(sheet_url).get_lastUpdateTime()
+
+    def reset(self):
+        """인증/핸들을 모두 버리고 다음 호출에서 새로 연결."""
+        with self._lock:
+            self._creds = None
+            self._client = None
+            self._spreadsheets.clear()
+            self._worksheets.clear()
+
+    def forget(self, sheet_url: str):
+        """시트 하나의 스프레드시트/워크시트 핸들만 버림 (인증과 다른 시트 핸들은 유지)."""
+        with self._lock:
+            self._spreadsheets.pop(sheet_url, None)
+            for key in [k for k in self._worksheets if k[0] == sheet_url]:
+                del self._worksheets[key]
+
+    def run(self, sheet_url: str, worksheet: str, fn):
+        """워크시트 핸들로 fn(ws)를 실행. 인증 만료(401/RefreshError)면 한 번 재연결 후 재시도.
+
+        403(공유 해제 등)은 그 시트의 핸들만 버리고 그대로 올림.
+        """
+        try:
+            return fn(self.worksheet(sheet_url, worksheet))
+        except Exception as e:
+            if _is_permission_error(e):
+                self.forget(sheet_url)
+                metrics.incr("sheets_permission_errors", backend="gsheets")
+                raise
+            if not _is_auth_error(e):
+                raise
+            with self._lock:
+                self.reset()
+                self._stats["reconnects"] += 1
+            return fn(self.worksheet(sheet_url, worksheet))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats)
+
+
+@st.cache_resource
+def get_client_pool(source: str = "file") -> SheetsClientPool:
+    return SheetsClientPool(source)
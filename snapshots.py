@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import pandas as pd
+
+import metrics
+
+SNAPSHOT_DIR = Path(__file__).parent / ".cache" / "snapshots"
+_META_KEY = b"sheet_snapshot"
+
+
+class SnapshotStore:
+    """시트 로더 결과(DataFrame)를 Parquet으로 저장. 재시작 직후와 시트 장애 때 마지막 정상 값을 제공."""
+
+    def __init__(self, directory: Path = SNAPSHOT_DIR):
+        self.directory = Path(directory)
+
+    def _path(self, key: tuple) -> Path:
+        return self.directory / f"{hashlib.sha1(repr(key).encode()).hexdigest()}.parquet"
+
+    def save(self, key: tuple, df: pd.DataFrame, fetched_at: float, signal=None):
+        """fetched_at: 받아온 시각(epoch 초). signal: 변경 신호(modifiedTime) — 재시작 후 재검증에 사용."""
+        if not isinstance(df, pd.DataFrame):
+            return
+        import pyarrow as pa  # 첫 스냅샷 때만 불러옴 (콜드 스타트 단축)
+        import pyarrow.parquet as pq
+
+        # 시트 값은 숫자/문자가 섞인 object 열이 많아 그대로는 Arrow로 못 바꾸므로 문자열로 저장
+        obj_cols = [c for c in df.columns if df[c].dtype == object]
+        table = pa.Table.from_pandas(df.astype({c: "string" for c in obj_cols}), preserve_index=True)
+        meta = json.dumps({"key": repr(key), "fetched_at": fetched_at, "signal": signal}).encode()
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), _META_KEY: meta})
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp = path.with_suffix(".tmp")
+        with metrics.span("snapshot_write", cache=key[0]):
+            pq.write_table(table, tmp)
+            os.replace(tmp, path)  # 쓰는 도중 죽어도 이전 스냅샷은 온전히 남도록
+
+    def load(self, key: tuple) -> tuple[pd.DataFrame, float, object] | None:
+        """(DataFrame, fetched_at, signal). 없거나 읽을 수 없으면 None."""
+        path = self._path(key)
+        if not path.exists():
+            return None
+        import pyarrow.parquet as pq
+
+        try:
+            with metrics.span("snapshot_read", cache=key[0]):
+                table = pq.read_table(path)
+            meta = json.loads(table.schema.metadata[_META_KEY])
+            df = table.to_pandas()
+        except Exception:
+            return None
+        # 저장할 때 문자열로 바꾼 열은 원래처럼 object 열로 (빈 칸은 "")
+        for c in df.columns:
+            if isinstance(df[c].dtype, pd.StringDtype):
+                df[c] = df[c].astype(object).where(df[c].notna(), "")
+        return df, meta["fetched_at"], meta.get("signal")
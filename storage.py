@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import json
+import random
+import sqlite3
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import streamlit as st
+
+import metrics
+from resilience import get_breaker_group
+from settings import get_setting
+from sheets_client import get_client_pool
+
+if TYPE_CHECKING:
+    import gspread  # 실제 import는 쓰는 함수 안에서 (콜드 스타트 단축)
+
+LOCAL_DB_PATH = Path(__file__).parent / ".cache" / "local_sheets.sqlite3"
+
+
+# --------------------
+# 저장소 백엔드
+# --------------------
+# 로더들은 backend.run(sheet_url, worksheet, fn)과 backend.last_update_time(sheet_url)만 사용한다.
+# fn(ws)에 넘어가는 ws는 gspread.Worksheet 또는 같은 메서드를 가진 LocalWorksheet.
+#   - "gsheets": sheets_client.SheetsClientPool (실제 구글 시트)
+#   - "local":   LocalSheetsBackend (SQLite, 지연/쿼터 오류 주입 가능한 Sheets API 대역)
+
+
+def quota_error(message: str = "Quota exceeded for quota metric 'Read requests'") -> gspread.exceptions.APIError:
+    """Sheets API의 429 응답과 같은 모양의 APIError."""
+    import gspread
+    import requests
+
+    resp = requests.Response()
+    resp.status_code = 429
+    resp._content = json.dumps(
+        {"error": {"code": 429, "message": message, "status": "RESOURCE_EXHAUSTED"}}
+    ).encode()
+    return gspread.exceptions.APIError(resp)
+
+
+class LocalWorksheet:
+    """LocalSheetsBackend의 워크시트 한 장. 앱이 쓰는 gspread.Worksheet 메서드만 구현."""
+
+    def __init__(self, backend: LocalSheetsBackend, sheet_url: str, title: str):
+        self.backend = backend
+        self.sheet_url = sheet_url
+        self.title = title
+
+    def _values(self) -> list[list[str]]:
+        return self.backend._read(self.sheet_url, self.title)
+
+    @property
+    def row_count(self) -> int:
+        return max(len(self._values()), 1000)  # 구글 시트 기본 격자 크기처럼
+
+    def get_all_values(self) -> list[list[str]]:
+        self.backend._api_call("read")
+        return self._values()
+
+    def get_all_records(self) -> list[dict]:
+        from gspread.utils import numericise_all
+
+        self.backend._api_call("read")
+        values = self._values()
+        if not values:
+            return []
+        header, rows = values[0], values[1:]
+        return [dict(zip(header, numericise_all((r + [""] * len(header))[:len(header)]))) for r in rows]
+
+    def row_values(self, row: int) -> list[str]:
+        self.backend._api_call("read")
+        values = self._values()
+        return list(values[row - 1]) if len(values) >= row else []
+
+    def _range(self, values: list[list[str]], a1: str) -> list[list[str]]:
+        from gspread.utils import a1_range_to_grid_range
+
+        grid = a1_range_to_grid_range(a1)
+        r0, r1 = grid.get("startRowIndex", 0), grid.get("endRowIndex", len(values))
+        c0, c1 = grid.get("startColumnIndex", 0), grid.get("endColumnIndex")
+        out = [row[c0:c1] for row in values[r0:r1]]
+        # Sheets API처럼 뒤쪽 빈 셀/빈 행은 생략
+        out = [r[:max([i + 1 for i, v in enumerate(r) if v != ""], default=0)] for r in out]
+        while out and not out[-1]:
+            out.pop()
+        return out
+
+    def get(self, a1: str) -> list[list[str]]:
+        self.backend._api_call("read")
+        return self._range(self._values(), a1)
+
+    def batch_get(self, ranges: list[str]) -> list[list[list[str]]]:
+        self.backend._api_call("read")
+        values = self._values()
+        return [self._range(values, a1) for a1 in ranges]
+
+    def append_row(self, values: list, value_input_option: str | None = None):
+        self.append_rows([values], value_input_option=value_input_option)
+
+    def append_rows(self, values: list[list], value_input_option: str | None = None):
+        self.backend._api_call("write")
+        self.backend._append(self.sheet_url, self.title, [[str(v) for v in r] for r in values])
+
+
+class LocalSheetsBackend:
+    """SQLite에 시트를 저장하는 로컬 백엔드 겸 Sheets API 대역.
+
+    latency_ms: 호출마다 넣는 지연, error_rate: 무작위 429 비율,
+    quota_per_minute: 분당 호출 한도(넘으면 429).
+    """
+
+    def __init__(self, db_path: Path = LOCAL_DB_PATH, latency_ms: float = 0, error_rate: float = 0.0,
+                 quota_per_minute: int | None = None):
+        self.db_path = Path(db_path)
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.quota_per_minute = quota_per_minute
+        self._lock = threading.Lock()
+        self._calls: deque[float] = deque()
+        self._stats = {"read": 0, "write": 0, "metadata": 0, "quota_errors": 0}
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._db() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS sheet_rows ("
+                " sheet_url TEXT NOT NULL, worksheet TEXT NOT NULL, row_idx INTEGER NOT NULL, values_json TEXT NOT NULL,"
+                " PRIMARY KEY (sheet_url, worksheet, row_idx))"
+            )
+            db.execute("CREATE TABLE IF NOT EXISTS sheets (sheet_url TEXT PRIMARY KEY, modified TEXT NOT NULL)")
+
+    def _db(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    def _api_call(self, kind: str):
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        now = time.monotonic()
+        metrics.incr("sheets_api_calls", backend="local", kind=kind)
+        with self._lock:
+            self._stats[kind] += 1
+            while self._calls and now - self._calls[0] > 60:
+                self._calls.popleft()
+            over_quota = self.quota_per_minute is not None and len(self._calls) >= self.quota_per_minute
+            if not over_quota:
+                self._calls.append(now)
+            if over_quota or (self.error_rate and random.random() < self.error_rate):
+                self._stats["quota_errors"] += 1
+                raise quota_error()
+
+    def _read(self, sheet_url: str, worksheet: str) -> list[list[str]]:
+        with self._db() as db:
+            rows = db.execute(
+                "SELECT values_json FROM sheet_rows WHERE sheet_url = ? AND worksheet = ? ORDER BY row_idx",
+                (sheet_url, worksheet),
+            ).fetchall()
+        metrics.incr("sheets_bytes_fetched", sum(len(r[0]) for r in rows), backend="local")
+        return [json.loads(r[0]) for r in rows]
+
+    def _append(self, sheet_url: str, worksheet: str, rows: list[list[str]]):
+        with self._lock, self._db() as db:
+            start = db.execute(
+                "SELECT COALESCE(MAX(row_idx), 0) FROM sheet_rows WHERE sheet_url = ? AND worksheet = ?",
+                (sheet_url, worksheet),
+            ).fetchone()[0]
+            db.executemany(
+                "INSERT INTO sheet_rows (sheet_url, worksheet, row_idx, values_json) VALUES (?, ?, ?, ?)",
+                [(sheet_url, worksheet, start + i + 1, json.dumps(r, ensure_ascii=False)) for i, r in enumerate(rows)],
+            )
+            db.execute(
+                "INSERT OR REPLACE INTO sheets (sheet_url, modified) VALUES (?, ?)",
+                (sheet_url, datetime.now(timezone.utc).isoformat()),
+            )
+
+    # --- 백엔드 인터페이스 ---
+    def run(self, sheet_url: str, worksheet: str, fn):
+        return fn(LocalWorksheet(self, sheet_url, worksheet))
+
+    def last_update_time(self, sheet_url: str) -> str:
+        self._api_call("metadata")
+        with self._db() as db:
+            row = db.execute("SELECT modified FROM sheets WHERE sheet_url = ?", (sheet_url,)).fetchone()
+        return row[0] if row else ""
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats)
+
+    # --- 테스트/부하 측정용 ---
+    def seed(self, sheet_url: str, worksheet: str, values: list[list]):
+        """워크시트 내용을 values로 교체."""
+        with self._db() as db:
+            db.execute("DELETE FROM sheet_rows WHERE sheet_url = ? AND worksheet = ?", (sheet_url, worksheet))
+        if values:
+            self._append(sheet_url, worksheet, [[str(v) for v in r] for r in values])
+
+    def set_cell(self, sheet_url: str, worksheet: str, row: int, col: int, value: str):
+        """(1부터 시작하는) 셀 하나를 수정. 답변 입력 같은 편집을 흉내낼 때 사용."""
+        values = self._read(sheet_url, worksheet)
+        cells = values[row - 1]
+        cells += [""] * (col - len(cells))
+        cells[col - 1] = value
+        with self._lock, self._db() as db:
+            db.execute(
+                "UPDATE sheet_rows SET values_json = ? WHERE sheet_url = ? AND worksheet = ? AND row_idx = ?",
+                (json.dumps(cells, ensure_ascii=False), sheet_url, worksheet, row),
+            )
+            db.execute(
+                "INSERT OR REPLACE INTO sheets (sheet_url, modified) VALUES (?, ?)",
+                (sheet_url, datetime.now(timezone.utc).isoformat()),
+            )
+
+
+@st.cache_resource
+def get_local_backend() -> LocalSheetsBackend:
+    quota = get_setting("local_sheets_quota_per_minute")
+    return LocalSheetsBackend(
+        Path(get_setting("local_sheets_path", LOCAL_DB_PATH)),
+        latency_ms=float(get_setting("local_sheets_latency_ms", 0)),
+        error_rate=float(get_setting("local_sheets_error_rate", 0.0)),
+        quota_per_minute=int(quota) if quota else None,
+    )
+
+
+def storage_backend_name() -> str:
+    return get_setting("storage_backend", "gsheets")
+
+
+def get_storage_backend(source: str = "file"):
+    """설정(storage_backend / STORAGE_BACKEND)에 따라 구글 시트 풀 또는 로컬 백엔드를 반환.
+
+    source는 구글 시트 백엔드의 인증 소스("file" / "secrets")이며 로컬 백엔드에서는 무시된다.
+    """
+    if storage_backend_name() == "local":
+        return get_local_backend()
+    return get_client_pool(source)
+
+
+def get_storage_breakers():
+    """저장소 백엔드 호출(읽기/쓰기 공용)의 회로 차단기 묶음 (시트별 + 쿼터). 스크립트 스레드에서 받아 넘겨 쓴다."""
+    return get_breaker_group(f"storage:{storage_backend_name()}")
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import hashlib
+import pickle
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from html import escape
+
+import pandas as pd
+
+import metrics
+from grading import GradingRules, TaskColumn
+
+# --- 발표일정 표 (학생 × 과제) HTML 생성 ---
+TABLE_CSS = """
+    <style>
+        .styled-table { width: 100%; border-collapse: collapse; margin-top: 20px; }
+        .styled-table th, .styled-table td {
+            border: 1px solid #ccc; padding: 10px; text-align: center; vertical-align: middle;
+            word-break: keep-all;
+        }
+        .styled-table th { font-weight: bold; }
+        .header-row-1 th { height: 2.5em; padding: 5px; }
+        .student-info-col { }
+        .task-col { width: 4.5%; }
+        .bg-blue { background-color: #dbe5f1 !important; }
+        .bg-green { background-color: #e2efda !important; }
+        .bg-pink { background-color: #f8cbad !important; }
+        .bg-purple { background-color: #e8dff5 !important; }
+    </style>
+    """
+
+TABLE_TAIL = "</tbody></table>"
+# 총점 열 (grading.GradeEngine) — 첫 머리글 행 끝에 붙임
+TOTAL_HEAD_CELL = '<th class="bg-blue student-info-col" rowspan="2">총점</th>'
+# 강의 파일에 [grading]이 없을 때의 명단 열
+DEFAULT_RULES = GradingRules()
+
+# 내용 해시 → 완성된 HTML (최근 것만 유지)
+_HTML_CACHE_SIZE = 32
+_html_cache: OrderedDict[tuple, str] = OrderedDict()
+_html_cache_lock = threading.Lock()
+
+
+def content_hash(df: pd.DataFrame) -> str:
+    # 작은 표에서는 hash_pandas_object보다 값 목록을 pickle 하는 편이 훨씬 빠름
+    payload = (list(df.columns), df.to_numpy().tolist())
+    return hashlib.sha1(pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)).hexdigest()
+
+
+@lru_cache(maxsize=32)
+def table_head(info_columns: tuple[str, ...], columns: tuple[TaskColumn, ...], extra: tuple[str, ...],
+               with_total: bool) -> str:
+    """두 행짜리 머리글. 과제 열은 강의 파일의 [grading] columns, 그보다 많은 시트 열은 열 이름 그대로."""
+    top = [f'<th class="bg-blue student-info-col" rowspan="2">{escape(c)}</th>' for c in info_columns]
+    bottom = []
+    for c in columns:
+        if c.label:
+            top.append(f'<th class="bg-{c.color} task-col">{c.head}</th>')
+            bottom.append(f'<th class="bg-{c.color} task-col">{c.label}</th>')
+        else:
+            top.append(f'<th class="bg-{c.color} task-col" rowspan="2">{c.head}</th>')
+    top += [f'<th class="bg-green task-col" rowspan="2">{escape(name)}</th>' for name in extra]
+    if with_total:
+        top.append(TOTAL_HEAD_CELL)
+    return ("<table class='styled-table'><thead>"
+            f'<tr class="header-row-1">{"".join(top)}</tr><tr>{"".join(bottom)}</tr></thead>')
+
+
+def _head_for(df: pd.DataFrame, rules: GradingRules, with_total: bool) -> str:
+    n_tasks = max(0, df.shape[1] - rules.task_start)
+    columns = rules.columns[:n_tasks]
+    extra = tuple(str(c) for c in df.columns[rules.task_start + len(columns):])
+    return table_head(tuple(rules.info_columns), columns, extra, with_total)
+
+
+def render_table_body(df: pd.DataFrame, totals: pd.Series | None = None, rules: GradingRules = DEFAULT_RULES) -> str:
+    """행마다 셀을 이어붙이지 않고, 열 단위로 <td> 목록을 만든 뒤 행마다 join 한 번."""
+    if df.empty:
+        return ""
+    info = df.reindex(columns=list(rules.info_columns))
+    frame = pd.concat([info, df.iloc[:, rules.task_start:]], axis=1)
+    # 결측값은 빈 칸, 모든 값을 한 번에 문자열 이스케이프
+    values = frame.astype(object).where(frame.notna(), "").to_numpy().T.tolist()
+
+    purple = {i for i, c in enumerate(rules.columns) if c.color == "purple"}
+    tags = ['<td class="bg-blue student-info-col">'] * len(rules.info_columns) + [
+        f"<td class='task-col {'bg-purple' if i in purple else ''}'>"
+        for i in range(df.shape[1] - rules.task_start)
+    ]
+    columns = [[f"{tag}{escape(str(v))}</td>" for v in col] for tag, col in zip(tags, values)]
+    if totals is not None:
+        columns.append([f'<td class="bg-blue student-info-col"><b>{v:g}</b></td>' for v in totals.tolist()])
+    return "".join(["<tr>" + "".join(cells) + "</tr>" for cells in zip(*columns)])
+
+
+def generate_styled_html_table(df: pd.DataFrame, totals: pd.Series | None = None,
+                               rules: GradingRules | None = None) -> str:
+    """발표일정 DataFrame → 스타일 HTML 표. 같은 내용·머리글이면 캐시된 HTML을 그대로 반환.
+
+    totals: 학생별 총점 (df와 같은 행 순서). 주면 마지막에 총점 열을 붙인다.
+    rules: 강의의 [grading] (명단 열, 과제 열 머리글과 색). 없으면 시트 열 이름을 그대로 머리글로.
+    """
+    rules = rules or DEFAULT_RULES
+    head = _head_for(df, rules, totals is not None)
+    # 강의마다 머리글이 다르므로 키에 머리글도 넣음 (같은 시트를 쓰는 강의끼리 섞이지 않도록)
+    key = (content_hash(df), None if totals is None else content_hash(totals.to_frame()), head)
+    with _html_cache_lock:
+        html = _html_cache.get(key)
+        if html is not None:
+            _html_cache.move_to_end(key)
+            metrics.incr("html_table_cache_events", event="hit")
+            return html
+
+    metrics.incr("html_table_cache_events", event="miss")
+    with metrics.span("render_schedule_table"):
+        html = TABLE_CSS + head + "<tbody>" + render_table_body(df, totals, rules) + TABLE_TAIL
+    metrics.incr("rows_rendered", len(df), view="schedule_table")
+
+    with _html_cache_lock:
+        _html_cache[key] = html
+        while len(_html_cache) > _HTML_CACHE_SIZE:
+            _html_cache.popitem(last=False)
+    return html
+
+
+# --- 주차별 강의 계획 표 (강의 파일의 [schedule] → courses.Course.schedule) ---
+def weekly_plan_html(schedule: pd.DataFrame) -> str:
+    """단계 열은 불러올 때 계산해 둔 rowspan으로 합침. 값은 강의 파일이 쓴 HTML(<br>, <font>) 그대로."""
+    columns = [c for c in schedule.columns if c != "rowspan"]
+    head = "".join(f'<th class="bg-blue">{c}</th>' for c in columns)
+    rows = []
+    for i, record in enumerate(schedule.to_dict("records")):
+        cells = []
+        for c in columns:
+            if c == "단계" and "rowspan" in record:
+                if record[c] or i == 0:  # 병합 묶음의 첫 행에만 칸을 둠
+                    cells.append(f'<td class="bg-green" rowspan="{record["rowspan"]}">{record[c]}</td>')
+                continue
+            cells.append(f"<td>{record[c]}</td>")
+        rows.append("<tr>" + "".join(cells) + "</tr>")
+    return TABLE_CSS + f"<table class='styled-table'><thead><tr>{head}</tr></thead><tbody>" + "".join(rows) + TABLE_TAIL
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# 앱 모듈은 저장소 최상위에 평평하게 있음
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,47 @@
+from pathlib import Path
+
+import pytest
+
+from courses import Course, load_courses
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def courses_dir(tmp_path):
+    (tmp_path / "good.toml").write_text('title = "강의"\nqna_sheet_url = "https://example.com/qna"\n', encoding="utf-8")
+    return tmp_path
+
+
+def test_shipped_courses_load():
+    errors = {}
+    courses = load_courses(ROOT / "courses", errors)
+    assert "history-thesis-1" in courses and errors == {}
+    course = courses["history-thesis-1"]
+    assert course.grading.task_start == 4 and len(course.grading.columns) == 19
+    assert course.objectives and course.rubric and not course.schedule.empty
+
+
+@pytest.mark.parametrize("text, reason", [
+    ('title = "강의"\nqna_url = "x"\n', "qna_url"),  # 오타 난 키
+    ('title = "강의"\nid = "other"\n', "id"),
+    ('code = "X"\n', "title"),
+    ('title = "강의\n', ""),  # TOML 문법 오류
+    ('title = "강의"\n[schedule]\n"주차" = ["1주", "2주"]\n"내용" = ["a"]\n', ""),
+    ('title = "강의"\n[grading]\ncolumns = [{ head = "1", kind = "lab" }]\n', "lab"),  # deductions에 없는 종류
+    ('title = "강의"\n[grading]\nbase = 60\n', "base"),
+    ('title = "강의"\n[[rubric]]\nitem = "발표"\n', ""),  # condition/points 없음
+])
+def test_broken_file_is_skipped_and_reported(courses_dir, text, reason):
+    (courses_dir / "broken.toml").write_text(text, encoding="utf-8")
+    errors = {}
+    courses = load_courses(courses_dir, errors)
+    assert list(courses) == ["good"]
+    assert list(errors) == ["broken"]
+    assert errors["broken"].startswith("broken.toml: ") and reason in errors["broken"]
+
+
+def test_unknown_key_raises_from_file(courses_dir):
+    (courses_dir / "typo.toml").write_text('title = "강의"\nprofesor = "x"\n', encoding="utf-8")
+    with pytest.raises(ValueError, match="profesor"):
+        Course.from_file(courses_dir / "typo.toml")
@@ -0,0 +1,86 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import grading
+from courses import Course
+from grading import GradeEngine, GradingRules, deductions
+
+ROOT = Path(__file__).resolve().parent.parent
+# 감점 규칙과 열 배치는 강의 파일의 [grading]
+RULES = Course.from_file(ROOT / "courses" / "history-thesis-1.toml").grading
+
+INFO = ["순번", "학과", "학번", "성명"]
+TASKS = [f"과제{i + 1}" for i in range(19)]
+
+
+def roster(rows: dict[str, dict[int, str]]) -> pd.DataFrame:
+    """{학번: {열 위치: 상태}} → 발표일정 형태의 DataFrame (나머지 과제 칸은 'O')."""
+    data = []
+    for n, (sid, cells) in enumerate(rows.items(), start=1):
+        row = [n, "국사학과", sid, f"학생{n}"] + ["O"] * len(TASKS)
+        for col, status in cells.items():
+            row[col] = status
+        data.append(row)
+    return pd.DataFrame(data, columns=INFO + TASKS)
+
+
+def test_hand_computed_roster():
+    df = roster({
+        "A": {},
+        # 과제 열: 불이행 -5, 미제출 -4, 지각 -2, 미비 -1, 결석 -1
+        "B": {4: "불이행", 5: "미제출", 6: "지각", 7: "미비", 8: "결석", 9: "-"},
+        # 교수1(11) -5, 글쓰기1(14) -5, 공백 제거 후 미제출 -4, 면담 열의 '지각'은 기준 없음 → 0
+        "C": {11: "불이행", 14: "기한 내 불이행", 4: " 미제출 ", 17: "지각"},
+        "D": {5: None, 6: ""},
+    })
+    assert GradeEngine(RULES).totals(df).tolist() == [60.0, 47.0, 46.0, 60.0]
+
+
+def test_unrecognized_cells_are_reported():
+    # 오타("미제츨"), 기준표에 없는 값("X"), 면담 열의 '지각'은 감점 없이 지나가므로 따로 셈
+    df = roster({"A": {4: "미제츨", 5: "X"}, "B": {17: "지각", 6: "X"}, "C": {4: "미제출"}})
+    engine = GradeEngine(RULES)
+    assert engine.totals(df).tolist() == [60.0, 60.0, 56.0]
+    assert engine.stats() == {"rows": 3, "unrecognized_cells": 4,
+                              "unrecognized_values": {"X": 2, "미제츨": 1, "지각": 1}}
+
+    fixed = df.copy()
+    fixed.iloc[0, 4] = "미제출"
+    engine.totals(fixed)  # 고친 행만 다시 계산해도 집계는 명단 전체 기준
+    assert engine.stats()["unrecognized_values"] == {"X": 2, "지각": 1}
+
+
+def test_only_changed_rows_are_recomputed(monkeypatch):
+    df = roster({"A": {}, "B": {4: "미제출"}, "C": {}})
+    engine = GradeEngine(RULES)
+    assert engine.totals(df).tolist() == [60.0, 56.0, 60.0]
+
+    calls = []
+    monkeypatch.setattr(grading, "deductions", lambda tasks, rules: calls.append(len(tasks)) or deductions(tasks, rules))
+    changed = df.copy()
+    changed.iloc[0, 20] = "불이행"  # 글쓰기2
+    assert engine.totals(changed).tolist() == [55.0, 56.0, 60.0]
+    assert calls == [1]
+
+
+@pytest.mark.parametrize("rows", [0, 3])
+def test_roster_without_task_columns(rows):
+    df = pd.DataFrame([[i + 1, "국사학과", f"S{i}", f"학생{i}"] for i in range(rows)], columns=INFO)
+    totals = GradeEngine(RULES).totals(df)
+    assert totals.tolist() == [RULES.base_score] * rows
+    assert deductions(df.iloc[:, 4:], RULES).tolist() == [0.0] * rows
+
+
+def test_rules_come_from_the_course_file():
+    rules = GradingRules.from_dict({
+        "base_score": 100, "info_columns": ["학번"],
+        "columns": [{"head": "면담", "kind": "meeting"}],
+        "deductions": {"meeting": {"불이행": -10}, "task": {"결석": -2}},
+    })
+    df = pd.DataFrame([["A", "불이행", "결석"], ["B", "결석", "불이행"]], columns=["학번", "면담", "출석"])
+    # 면담 열에서는 meeting 기준, 목록에 없는 열은 task 기준 ('결석'은 면담 열에서 기준 없음)
+    assert GradeEngine(rules).totals(df).tolist() == [88.0, 100.0]
+    with pytest.raises(ValueError, match="lab"):
+        GradingRules.from_dict({"columns": [{"head": "1", "kind": "lab"}]})
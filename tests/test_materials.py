@@ -0,0 +1,40 @@
+import os
+import threading
+
+import pytest
+
+import materials
+from materials import MaterialIndex
+
+
+def make_index(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "notes.pdf").write_bytes(b"%PDF" * 100)
+    return MaterialIndex(src, tmp_path / "derived", tmp_path / "static")
+
+
+def test_index_is_built_off_the_request_thread(tmp_path, monkeypatch):
+    index = make_index(tmp_path)
+    release = threading.Event()
+    original = materials._sha256
+    monkeypatch.setattr(materials, "_sha256", lambda path: release.wait(5) and original(path))
+
+    assert index.materials(wait=0) == []  # 해시가 끝날 때까지 기다리지 않음
+    assert index.building
+    release.set()
+    assert [m.name for m in index.materials(wait=5)] == ["notes.pdf"]
+    assert not index.building
+
+
+def test_static_url_links_file_without_reading_it(tmp_path, monkeypatch):
+    index = make_index(tmp_path)
+    (material,) = index.materials(wait=5)
+    monkeypatch.setattr(type(material.path), "read_bytes", lambda self: pytest.fail("파일 바이트를 읽음"))
+
+    url = index.static_url(material)
+    assert url == f"{materials.STATIC_URL}/{material.sha256[:24]}/notes.pdf"
+    exported = tmp_path / "static" / material.sha256[:24] / "notes.pdf"
+    assert os.path.samefile(exported, material.path)
+    assert index.static_url(material) == url  # 두 번째부터는 그대로
+
@@ -0,0 +1,93 @@
+import json
+
+import gspread
+import pytest
+import requests
+
+from qna_queue import QnaWriteQueue
+from resilience import BreakerGroup
+from storage import LocalSheetsBackend
+
+GOOD = "https://docs.google.com/spreadsheets/d/good/edit"
+BROKEN = "https://docs.google.com/spreadsheets/d/broken/edit"
+
+
+def permission_denied():
+    resp = requests.Response()
+    resp.status_code = 403
+    resp._content = json.dumps({"error": {"code": 403, "message": "denied", "status": "PERMISSION_DENIED"}}).encode()
+    return gspread.exceptions.APIError(resp)
+
+
+class FlakyBackend(LocalSheetsBackend):
+    """BROKEN 시트에 대한 호출만 실패."""
+
+    error = ConnectionError
+
+    def run(self, sheet_url, worksheet, fn):
+        if sheet_url == BROKEN:
+            raise self.error()
+        return super().run(sheet_url, worksheet, fn)
+
+
+@pytest.fixture(params=[ConnectionError, permission_denied], ids=["connection", "permission"])
+def queue(tmp_path, request):
+    backend = FlakyBackend(tmp_path / "sheets.sqlite3")
+    backend.error = request.param
+    # 백그라운드 스레드는 테스트 중에 깨어나지 않도록 (간격을 길게 + 즉시 깨우기 끔)
+    # 운영과 같이 실제 회로 차단기 묶음(시트별 + 쿼터)을 거침
+    queue = QnaWriteQueue(backend, spool_path=tmp_path / "spool.sqlite3", flush_interval_ms=3_600_000, max_batch=3,
+                          breakers=BreakerGroup("test"))
+    queue._wakeup.set = lambda: None
+    return queue
+
+
+def questions(queue, sheet_url):
+    return [r[2] for r in queue.backend._read(sheet_url, "Questions")[1:]]
+
+
+def test_failing_sheet_does_not_starve_others(queue):
+    # 실패하는 시트의 행이 먼저, 그리고 max_batch보다 많이 쌓여 있어도
+    for i in range(5):
+        queue.submit(BROKEN, "a", f"b{i}")
+    for i in range(2):
+        queue.submit(GOOD, "a", f"g{i}")
+
+    assert queue.flush() == 2
+    assert questions(queue, GOOD) == ["g0", "g1"]
+    assert len(queue.pending_rows(BROKEN)) == 5
+    assert BROKEN in queue.last_errors and GOOD not in queue.last_errors
+
+
+def test_backoff_is_per_sheet(queue):
+    queue.submit(BROKEN, "a", "b0")
+    queue.flush()
+    delay, _ = queue._retry[BROKEN]
+
+    # BROKEN은 재시도 대기 중이라 건너뛰고, GOOD은 바로 반영
+    queue.submit(GOOD, "a", "g0")
+    assert queue.flush() == 1
+    assert queue._retry[BROKEN][0] == delay
+    assert GOOD not in queue._retry
+
+
+def test_batches_are_per_sheet(queue):
+    for i in range(4):
+        queue.submit(GOOD, "a", f"g{i}")
+    assert queue.flush() == 3  # 시트당 max_batch행
+    assert queue.flush() == 1
+    assert questions(queue, GOOD) == ["g0", "g1", "g2", "g3"]
+
+
+def test_broken_sheet_breaker_does_not_block_other_sheets(queue):
+    queue.submit(BROKEN, "a", "b0")
+    for _ in range(5):
+        queue._retry.clear()  # 재시도 대기를 건너뛰고 차단기가 열릴 때까지 반복 실패
+        assert queue.flush() == 0
+
+    queue.submit(GOOD, "a", "g0")
+    queue._retry.clear()
+    assert queue.flush() == 1
+    assert questions(queue, GOOD) == ["g0"]
+    stats = queue.breakers.stats()
+    assert stats[f"test:{GOOD}"]["state"] == "closed" and stats["test:quota"]["state"] == "closed"
@@ -0,0 +1,83 @@
+import pandas as pd
+import pytest
+
+import qna_sync
+import storage
+from qna_sync import QNA_HEADER, QnaDeltaSync
+from storage import LocalSheetsBackend
+
+URL = "https://docs.google.com/spreadsheets/d/test-qna/edit"
+
+
+@pytest.fixture
+def backend(tmp_path):
+    return LocalSheetsBackend(tmp_path / "sheets.sqlite3")
+
+
+def seed(backend, rows):
+    backend.seed(URL, "Questions", [QNA_HEADER] + rows)
+
+
+def questions(sync):
+    return sync.refresh()[["Question", "Answer"]].values.tolist()
+
+
+def test_delta_sync_appends_new_rows_and_answers(backend, monkeypatch):
+    seed(backend, [["t1", "a", "q1", ""], ["t2", "b", "q2", ""]])
+    sync = QnaDeltaSync(backend, URL)
+    assert questions(sync) == [["q1", ""], ["q2", ""]]
+
+    backend.set_cell(URL, "Questions", 2, 4, "A1")
+    backend._append(URL, "Questions", [["t3", "c", "q3", ""]])
+    # 두 번째부터는 전체 조회 없이 증분 조회만
+    monkeypatch.setattr(storage.LocalWorksheet, "get_all_values", lambda ws: pytest.fail("full sync"))
+    assert questions(sync) == [["q1", "A1"], ["q2", ""], ["q3", ""]]
+
+
+def test_delta_sync_resyncs_when_rows_shift(backend):
+    seed(backend, [["t1", "a", "q1", ""], ["t2", "b", "q2", ""], ["t3", "c", "q3", ""]])
+    sync = QnaDeltaSync(backend, URL)
+    questions(sync)
+
+    # q1 삭제 + q4 추가: 행 수는 같지만 위치가 한 칸씩 밀림
+    seed(backend, [["t2", "b", "q2", "A2"], ["t3", "c", "q3", ""], ["t4", "d", "q4", ""]])
+    assert questions(sync) == [["q2", "A2"], ["q3", ""], ["q4", ""]]
+
+    # 행 수가 줄어든 경우
+    seed(backend, [["t3", "c", "q3", "A3"]])
+    assert questions(sync) == [["q3", "A3"]]
+
+
+def test_delta_failure_falls_back_to_full_sync(backend, monkeypatch):
+    seed(backend, [["t1", "a", "q1", ""]])
+    sync = QnaDeltaSync(backend, URL)
+    questions(sync)
+
+    def broken(ws, ranges):
+        raise ValueError("bad range")
+
+    monkeypatch.setattr(storage.LocalWorksheet, "batch_get", broken)
+    backend._append(URL, "Questions", [["t2", "b", "q2", "A"]])
+    assert questions(sync) == [["q1", ""], ["q2", "A"]]
+
+
+def test_delta_merges_into_existing_index(backend, monkeypatch):
+    seed(backend, [["t1", "a", "q1", ""], ["t2", "b", "Q2", ""], ["t3", "c", "q3", ""]])
+    sync = QnaDeltaSync(backend, URL)
+    first = sync.refresh()
+
+    indexed = []
+    original = qna_sync.build_qna_index
+    monkeypatch.setattr(qna_sync, "build_qna_index", lambda df: indexed.append(len(df)) or original(df))
+
+    # 변경 없음 → 같은 객체, 인덱싱 없음
+    assert sync.refresh() is first and indexed == []
+
+    backend.set_cell(URL, "Questions", 3, 4, "Yes")
+    backend._append(URL, "Questions", [["t4", "d", "q4", ""], ["t5", "e", "q5", "x"]])
+    merged = sync.refresh()
+    assert sorted(indexed) == [1, 2]  # 답변이 바뀐 행 1개 + 새 행 2개만
+    assert first.loc[1, "Answer"] == ""  # 이전 객체는 그대로
+
+    expected = original(pd.DataFrame(backend._read(URL, "Questions")[1:], columns=QNA_HEADER))
+    pd.testing.assert_frame_equal(merged, expected)
@@ -0,0 +1,96 @@
+import json
+
+import gspread
+import pytest
+import requests
+
+from resilience import BreakerGroup, CircuitBreaker, CircuitOpenError, is_backend_failure
+from storage import quota_error
+
+A = "https://docs.google.com/spreadsheets/d/a/edit"
+B = "https://docs.google.com/spreadsheets/d/b/edit"
+
+
+def api_error(code, status):
+    resp = requests.Response()
+    resp.status_code = code
+    resp._content = json.dumps({"error": {"code": code, "message": status, "status": status}}).encode()
+    return gspread.exceptions.APIError(resp)
+
+
+def fail_with(e):
+    def fn():
+        raise e
+    return fn
+
+
+@pytest.mark.parametrize("error, counted", [
+    (quota_error(), True),
+    (ConnectionError("reset"), True),
+    (TimeoutError(), True),
+    (api_error(503, "UNAVAILABLE"), True),
+    (api_error(401, "UNAUTHENTICATED"), True),
+    (api_error(403, "PERMISSION_DENIED"), False),
+    (gspread.exceptions.WorksheetNotFound("Questions"), False),
+    (ValueError("bad range"), False),
+])
+def test_is_backend_failure(error, counted):
+    assert is_backend_failure(error) is counted
+
+
+def test_request_errors_do_not_open_circuit():
+    breaker = CircuitBreaker("test", failure_threshold=2)
+    for _ in range(5):
+        with pytest.raises(gspread.exceptions.WorksheetNotFound):
+            breaker.call(fail_with(gspread.exceptions.WorksheetNotFound("Questions")))
+    assert breaker.stats() == {"state": "closed", "failures": 0}
+
+
+def test_transport_errors_open_circuit():
+    breaker = CircuitBreaker("test", failure_threshold=2)
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            breaker.call(fail_with(ConnectionError("reset")))
+    assert breaker.stats()["state"] == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda: "skipped")
+
+
+def test_half_open_probe_is_released_by_request_error():
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0)
+    with pytest.raises(ConnectionError):
+        breaker.call(fail_with(ConnectionError("reset")))
+    with pytest.raises(KeyError):
+        breaker.call(fail_with(KeyError("x")))  # half_open 시험 호출, 실패로 세지 않음
+    assert breaker.call(lambda: "ok") == "ok"
+    assert breaker.stats()["state"] == "closed"
+
+
+def test_sheet_failures_only_open_that_sheet():
+    group = BreakerGroup("test")
+    for _ in range(3):
+        with pytest.raises(ConnectionError):
+            group.call(A, fail_with(ConnectionError("reset")))
+    with pytest.raises(CircuitOpenError):
+        group.call(A, lambda: "skipped")
+    assert group.call(B, lambda: "ok") == "ok"
+    assert group.stats()["test:quota"]["state"] == "closed"
+
+
+def test_permission_denied_does_not_open_circuit():
+    group = BreakerGroup("test")
+    for _ in range(5):
+        with pytest.raises(gspread.exceptions.APIError):
+            group.call(A, fail_with(api_error(403, "PERMISSION_DENIED")))
+    assert group.stats()[f"test:{A}"] == {"state": "closed", "failures": 0}
+
+
+def test_quota_errors_open_the_whole_backend():
+    group = BreakerGroup("test")
+    for _ in range(3):
+        with pytest.raises(gspread.exceptions.APIError):
+            group.call(A, fail_with(quota_error()))
+    with pytest.raises(CircuitOpenError):
+        group.call(B, lambda: "skipped")
+    # 쿼터 오류는 시트 차단기에는 세지 않음
+    assert group.stats()[f"test:{A}"]["failures"] == 0
@@ -0,0 +1,60 @@
+import json
+
+import gspread
+import pytest
+import requests
+from google.auth.exceptions import RefreshError
+
+from sheets_client import SheetsClientPool
+
+A = "https://docs.google.com/spreadsheets/d/a/edit"
+B = "https://docs.google.com/spreadsheets/d/b/edit"
+
+
+def api_error(code, status):
+    resp = requests.Response()
+    resp.status_code = code
+    resp._content = json.dumps({"error": {"code": code, "message": status, "status": status}}).encode()
+    return gspread.exceptions.APIError(resp)
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    pool = SheetsClientPool("file")
+    # 인증 없이 캐시된 핸들만으로 동작하도록
+    monkeypatch.setattr(pool, "client", lambda: "client")
+    monkeypatch.setattr(pool, "spreadsheet", lambda url: pool._spreadsheets.setdefault(url, f"sh:{url}"))
+    for url in (A, B):
+        pool._spreadsheets[url] = f"sh:{url}"
+        pool._worksheets[(url, "Questions")] = f"ws:{url}"
+    return pool
+
+
+def fail_once(error):
+    calls = []
+
+    def fn(ws):
+        calls.append(ws)
+        if len(calls) == 1:
+            raise error
+        return "ok"
+    return fn, calls
+
+
+def test_permission_error_drops_only_that_sheet(pool):
+    fn, calls = fail_once(api_error(403, "PERMISSION_DENIED"))
+    with pytest.raises(gspread.exceptions.APIError):
+        pool.run(A, "Questions", fn)
+    assert len(calls) == 1  # 재시도/재연결 없음
+    assert list(pool._worksheets) == [(B, "Questions")]
+    assert list(pool._spreadsheets) == [B]
+    assert pool.stats()["reconnects"] == 0
+
+
+@pytest.mark.parametrize("error", [api_error(401, "UNAUTHENTICATED"), RefreshError("expired")])
+def test_auth_error_reconnects_and_retries(pool, monkeypatch, error):
+    monkeypatch.setattr(pool, "worksheet", lambda url, title: pool._worksheets.get((url, title), "fresh"))
+    fn, calls = fail_once(error)
+    assert pool.run(A, "Questions", fn) == "ok"
+    assert calls == [f"ws:{A}", "fresh"]
+    assert pool.stats()["reconnects"] == 1